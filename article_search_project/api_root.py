@@ -0,0 +1,46 @@
+"""
+Static payload served by the API root endpoint.
+
+This dict is the source of truth; the serialized bytes used at runtime live in
+``api_root_payload.py`` and are regenerated with ``scripts/gen_api_root.py``.
+The admin endpoint is only listed when the admin site is enabled, so a variant
+without it is generated as well (see ``without_admin``).
+"""
+
+API_ROOT = {
+    'message': 'Article Search API',
+    'version': '1.0.0',
+    'endpoints': {
+        'search': '/api/search/',
+        'content': '/api/content/',
+        'health': '/api/health/',
+        'admin': '/admin/'
+    },
+    'documentation': {
+        'search_endpoint': {
+            'method': 'POST',
+            'url': '/api/search/',
+            'description': 'Search for articles by title with language support',
+            'parameters': {
+                'query': 'string (required) - Search query',
+                'language': 'string (optional) - "en" or "ar", default: "en"',
+                'max_results': 'integer (optional) - Max results, default: 5'
+            }
+        },
+        'content_endpoint': {
+            'method': 'POST',
+            'url': '/api/content/',
+            'description': 'Retrieve full article content by ID',
+            'parameters': {
+                'article_id': 'UUID (required) - Article ID from search results',
+                'include_summary': 'boolean (optional) - Include AI summary, default: true'
+            }
+        }
+    }
+}
+
+
+def without_admin(payload):
+    """Copy of the root payload for deployments with ENABLE_ADMIN=False"""
+    endpoints = {name: url for name, url in payload['endpoints'].items() if name != 'admin'}
+    return {**payload, 'endpoints': endpoints}
@@ -0,0 +1,7 @@
+# Generated by scripts/gen_api_root.py from article_search_project/api_root.py.
+# Do not edit by hand.
+
+PAYLOAD = b'{"message":"Article Search API","version":"1.0.0","endpoints":{"search":"/api/search/","content":"/api/content/","health":"/api/health/","admin":"/admin/"},"documentation":{"search_endpoint":{"method":"POST","url":"/api/search/","description":"Search for articles by title with language support","parameters":{"query":"string (required) - Search query","language":"string (optional) - \\"en\\" or \\"ar\\", default: \\"en\\"","max_results":"integer (optional) - Max results, default: 5"}},"content_endpoint":{"method":"POST","url":"/api/content/","description":"Retrieve full article content by ID","parameters":{"article_id":"UUID (required) - Article ID from search results","include_summary":"boolean (optional) - Include AI summary, default: true"}}}}'
+
+# Served when ENABLE_ADMIN=False
+PAYLOAD_WITHOUT_ADMIN = b'{"message":"Article Search API","version":"1.0.0","endpoints":{"search":"/api/search/","content":"/api/content/","health":"/api/health/"},"documentation":{"search_endpoint":{"method":"POST","url":"/api/search/","description":"Search for articles by title with language support","parameters":{"query":"string (required) - Search query","language":"string (optional) - \\"en\\" or \\"ar\\", default: \\"en\\"","max_results":"integer (optional) - Max results, default: 5"}},"content_endpoint":{"method":"POST","url":"/api/content/","description":"Retrieve full article content by ID","parameters":{"article_id":"UUID (required) - Article ID from search results","include_summary":"boolean (optional) - Include AI summary, default: true"}}}}'
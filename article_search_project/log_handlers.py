@@ -0,0 +1,30 @@
+"""
+Non-blocking logging for the request path
+
+Log records are put on an in-memory queue and written out by a background
+QueueListener thread, so slow handlers (console, files) never block a request.
+See "Dealing with handlers that block" in the Python logging cookbook.
+"""
+import atexit
+from logging.config import ConvertingList
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+
+
+def _resolve_handlers(handlers):
+    """Resolve ``cfg://`` references when configured through dictConfig"""
+    if isinstance(handlers, ConvertingList):
+        return [handlers[i] for i in range(len(handlers))]
+    return handlers
+
+
+class QueueListenerHandler(QueueHandler):
+    """QueueHandler that owns and starts a QueueListener for its target handlers"""
+
+    def __init__(self, handlers, respect_handler_level=True):
+        super().__init__(SimpleQueue())
+        self.listener = QueueListener(
+            self.queue, *_resolve_handlers(handlers), respect_handler_level=respect_handler_level
+        )
+        self.listener.start()
+        atexit.register(self.listener.stop)
@@ -31,8 +31,11 @@ ALLOWED_HOSTS = ['*']  # Allow all hosts for development and deployment
 
 # Application definition
 
+# The admin site pulls in templates and extra app hooks; API-only deployments
+# can turn it off to cut worker start-up time and memory.
+ENABLE_ADMIN = config('ENABLE_ADMIN', default=True, cast=bool)
+
 INSTALLED_APPS = [
-    'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -43,6 +46,9 @@ INSTALLED_APPS = [
     'articles',
 ]
 
+if ENABLE_ADMIN:
+    INSTALLED_APPS.insert(0, 'django.contrib.admin')
+
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
@@ -85,6 +91,27 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Set REDIS_URL to share cached LLM responses and search results across workers.
+
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -120,6 +147,11 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = 'static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# Serve the API root payload from Django. Disable when the web server serves
+# the file written by ``manage.py render_api_root`` instead.
+SERVE_API_ROOT = config('SERVE_API_ROOT', default=True, cast=bool)
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -129,13 +161,52 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework configuration
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'articles.renderers.ORJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
     ],
 }
 
+# Logging: records go through a queue and are written by a background thread
+# (see article_search_project/log_handlers.py) so logging never blocks a request
+LOG_LEVEL = config('LOG_LEVEL', default='INFO')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'verbose': {
+            'format': '{asctime} {levelname} {name} {message}',
+            'style': '{',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'verbose',
+        },
+        'queue': {
+            '()': 'article_search_project.log_handlers.QueueListenerHandler',
+            'handlers': ['cfg://handlers.console'],
+        },
+    },
+    'root': {
+        'handlers': ['queue'],
+        'level': LOG_LEVEL,
+    },
+    'loggers': {
+        # Replaces Django's default console handler on this logger; without
+        # propagate=False its records would also reach the root queue and be
+        # printed twice
+        'django': {
+            'handlers': ['queue'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
@@ -143,6 +214,30 @@ CORS_ALLOW_CREDENTIALS = True
 # Groq API configuration
 GROQ_API_KEY = config('GROQ_API_KEY')
 
+# Retries for rate-limited (429) and failed (5xx) Groq calls; the SDK backs off
+# exponentially with jitter and honours retry-after
+GROQ_MAX_RETRIES = config('GROQ_MAX_RETRIES', default=4, cast=int)
+
+# After this many consecutive Groq failures, LLM calls are skipped (responses
+# use the fallback content) for GROQ_BREAKER_RESET_TIMEOUT seconds
+GROQ_BREAKER_MAX_FAILURES = config('GROQ_BREAKER_MAX_FAILURES', default=5, cast=int)
+GROQ_BREAKER_RESET_TIMEOUT = config('GROQ_BREAKER_RESET_TIMEOUT', default=30, cast=float)
+
+# Output cap for generated article content; lower it towards the completion
+# sizes logged by the content view to save tokens-per-minute quota
+GROQ_CONTENT_MAX_TOKENS = config('GROQ_CONTENT_MAX_TOKENS', default=3000, cast=int)
+
+# Search for real images when article content falls back to static text.
+# Off by default so the fallback path, which runs when Groq is failing, makes
+# no network calls.
+FALLBACK_DYNAMIC_IMAGES = config('FALLBACK_DYNAMIC_IMAGES', default=False, cast=bool)
+
+# Route bulk article generation through the Groq Batch API (for offline jobs).
+# GROQ_BATCH_TIMEOUT is how long to wait for a batch before falling back to a
+# real-time completion.
+GROQ_USE_BATCH_API = config('GROQ_USE_BATCH_API', default=False, cast=bool)
+GROQ_BATCH_TIMEOUT = config('GROQ_BATCH_TIMEOUT', default=600, cast=int)
+
 # URL configuration - Set to False if you don't want trailing slashes
 # APPEND_SLASH = False  # Uncomment this line if you prefer URLs without trailing slashes
 
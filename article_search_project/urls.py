@@ -14,47 +14,84 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
+import gzip
+import hashlib
+from functools import lru_cache
+
+from django.conf import settings
 from django.urls import path, include
-from django.http import JsonResponse
+from django.http import HttpResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import etag, require_safe
+from .api_root_payload import PAYLOAD as _PAYLOAD_WITH_ADMIN, PAYLOAD_WITHOUT_ADMIN
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+# The root payload only lists /admin/ when the admin site is routed
+PAYLOAD = _PAYLOAD_WITH_ADMIN if settings.ENABLE_ADMIN else PAYLOAD_WITHOUT_ADMIN
+
+# Encodings offered for the payload, in order of preference. The ETag is weak
+# because the byte-level representation differs between encodings.
+_API_ROOT_ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+_API_ROOT_ETAG = 'W/"%s"' % hashlib.sha1(PAYLOAD).hexdigest()
 
+def _negotiate_encoding(request):
+    """Return the preferred precompressed encoding accepted by the client, if any"""
+    accepted = set()
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = item.partition(';')
+        if params.replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        accepted.add(coding.strip().lower())
+    for encoding in _API_ROOT_ENCODINGS:
+        if encoding in accepted:
+            return encoding
+    return None
+
+@lru_cache(maxsize=None)
+def _api_root_variant(encoding):
+    """Build the body and headers for an encoding once, on first use"""
+    if encoding == 'br':
+        body = brotli.compress(PAYLOAD, quality=11)
+    elif encoding == 'gzip':
+        body = gzip.compress(PAYLOAD, 9)
+    else:
+        body = PAYLOAD
+    headers = {'Content-Length': str(len(body)), 'Vary': 'Accept-Encoding'}
+    if encoding:
+        headers['Content-Encoding'] = encoding
+    return body, headers
+
+@require_safe
+@cache_control(public=True, max_age=3600, immutable=True)
+@etag(lambda request: _API_ROOT_ETAG)
 def api_root(request):
     """Root API endpoint with available endpoints"""
-    return JsonResponse({
-        'message': 'Article Search API',
-        'version': '1.0.0',
-        'endpoints': {
-            'search': '/api/search/',
-            'content': '/api/content/',
-            'health': '/api/health/',
-            'admin': '/admin/'
-        },
-        'documentation': {
-            'search_endpoint': {
-                'method': 'POST',
-                'url': '/api/search/',
-                'description': 'Search for articles by title with language support',
-                'parameters': {
-                    'query': 'string (required) - Search query',
-                    'language': 'string (optional) - "en" or "ar", default: "en"',
-                    'max_results': 'integer (optional) - Max results, default: 5'
-                }
-            },
-            'content_endpoint': {
-                'method': 'POST', 
-                'url': '/api/content/',
-                'description': 'Retrieve full article content by ID',
-                'parameters': {
-                    'article_id': 'UUID (required) - Article ID from search results',
-                    'include_summary': 'boolean (optional) - Include AI summary, default: true'
-                }
-            }
-        }
-    })
+    # Deliberately sync: the project is deployed under WSGI, where an async
+    # view would be run through a one-off event loop on every request.
+    # A fresh response object is required per request because middleware and
+    # the WSGI handler mutate it; only the body bytes and headers are shared.
+    body, headers = _api_root_variant(_negotiate_encoding(request))
+    return HttpResponse(body, content_type='application/json', headers=headers)
 
+# Patterns are matched in order, so the high-traffic API routes come first
+# and the rarely used admin site (when enabled) goes last.
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('api/', include('articles.urls')),
-    path('', api_root, name='api-root'),
 ]
 
+# In production the root payload can be served as a static file by the web
+# server (see ``manage.py render_api_root``), in which case Django skips it.
+# The empty route is anchored and only matches "/", so it never acts as a
+# catch-all for unmatched URLs; it sits after the API include so API requests
+# do not test it first.
+if settings.SERVE_API_ROOT:
+    urlpatterns.insert(1, path('', api_root, name='api-root'))
+
+if settings.ENABLE_ADMIN:
+    from django.contrib import admin
+
+    urlpatterns.append(path('admin/', admin.site.urls))
@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class ArticlesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'articles'
+
+    def ready(self):
+        # Build the shared Groq service (clients and connection pools) at
+        # startup rather than inside the first request
+        if settings.GROQ_API_KEY:
+            from .groq_service import get_groq_service
+            self.groq_service = get_groq_service()
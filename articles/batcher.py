@@ -0,0 +1,46 @@
+"""
+Request coalescing for expensive upstream calls
+
+Under a burst, several requests often ask for exactly the same LLM generation
+within milliseconds of each other. SingleFlight lets the first of them make
+the call while the others wait for and share its result.
+"""
+from concurrent.futures import Future
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time; concurrent callers with the same
+    key block until it finishes and receive the same result (or exception)
+
+    The result object is shared between callers, so they must not mutate it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call fn(*args, **kwargs), or wait for the in-flight call with the same key"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+
+        if not leader:
+            return call.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
@@ -0,0 +1,102 @@
+"""
+Circuit breaker for upstream calls
+
+During a Groq outage every call waits out the SDK's timeouts and retries
+before failing, tying up a worker thread each time. CircuitBreaker counts
+consecutive failures and, past a threshold, rejects calls immediately so
+callers go straight to their fallbacks. After a cooldown a single trial call
+is let through; its outcome closes the circuit or opens it again.
+"""
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of making a call while the circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker shared by all threads
+
+    Only exceptions accepted by is_failure count against the circuit (all
+    exceptions by default); others, such as a rejected request, show that the
+    upstream is reachable and count as a success. Every exception is re-raised.
+    A call ended by a BaseException such as asyncio.CancelledError or
+    KeyboardInterrupt records no outcome but still frees the half-open trial.
+    """
+
+    def __init__(self, name: str, max_failures: int = 5, reset_timeout: float = 30.0,
+                 is_failure: Optional[Callable[[BaseException], bool]] = None):
+        self.name = name
+        self.max_failures = max_failures
+        self.reset_timeout = reset_timeout
+        self.is_failure = is_failure or (lambda exc: True)
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open_until = 0.0
+        self._trial_running = False
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call fn(*args, **kwargs) through the breaker"""
+        trial = self._before_call()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self._after_call(trial, self.is_failure(e))
+            raise
+        except BaseException:
+            self._release_trial(trial)
+            raise
+        self._after_call(trial, False)
+        return result
+
+    async def acall(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Await fn(*args, **kwargs) through the breaker"""
+        trial = self._before_call()
+        try:
+            result = await fn(*args, **kwargs)
+        except Exception as e:
+            self._after_call(trial, self.is_failure(e))
+            raise
+        except BaseException:
+            self._release_trial(trial)
+            raise
+        self._after_call(trial, False)
+        return result
+
+    def _before_call(self) -> bool:
+        """Raise CircuitOpenError if the call must not run; return whether it is the half-open trial"""
+        with self._lock:
+            if not self._open_until:
+                return False
+            if time.monotonic() < self._open_until or self._trial_running:
+                raise CircuitOpenError(f"{self.name} circuit is open")
+            self._trial_running = True
+            return True
+
+    def _release_trial(self, trial: bool) -> None:
+        """Let another call make the half-open trial, without closing or reopening the circuit"""
+        if trial:
+            with self._lock:
+                self._trial_running = False
+
+    def _after_call(self, trial: bool, failed: bool) -> None:
+        with self._lock:
+            if trial:
+                self._trial_running = False
+            if not failed:
+                if self._open_until:
+                    logger.info("%s circuit closed", self.name)
+                self._failures = 0
+                self._open_until = 0.0
+                return
+            self._failures += 1
+            if trial or self._failures >= self.max_failures:
+                self._open_until = time.monotonic() + self.reset_timeout
+                self._failures = 0
+                logger.warning("%s circuit opened for %.0fs", self.name, self.reset_timeout)
@@ -1,18 +1,567 @@
-from groq import Groq
+from groq import APIConnectionError, AsyncGroq, Groq, InternalServerError, RateLimitError
+from asgiref.sync import async_to_sync
 from django.conf import settings
+from django.core.cache import cache
+from django.templatetags.static import static
+import asyncio
+import hashlib
+import httpx
 import json
+import logging
 import uuid
 import requests
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from types import MappingProxyType
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import quote_plus
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List, Tuple
+
+from .circuit import CircuitBreaker, CircuitOpenError
+from .json_utils import dumps, loads
+from . import llm_cache
+
+logger = logging.getLogger(__name__)
+
+# Shared HTTP session for image lookups so connections (and TLS sessions) are
+# reused across calls instead of being re-established per request
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=Retry(total=2, backoff_factor=0.2))
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+# Mimic a real browser on every scrape; requests already negotiates gzip/deflate
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,*/*;q=0.8'
+})
+
+_GOOGLE_IMAGE_RE = re.compile(r'"(https?://[^"]*\.(?:jpg|jpeg|png|webp|gif))"', re.IGNORECASE)
+_BRITANNICA_IMAGE_RE = re.compile(r'(https://cdn\.britannica\.com/[^"]*\.(?:jpg|jpeg|png))', re.IGNORECASE)
+
+# Connection pool for the Groq API clients; shared by every request through the
+# get_groq_service() singleton so keep-alive connections are reused
+_GROQ_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+_GROQ_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+# Labelled fields in sentiment responses, in either language
+_SENTIMENT_RE = re.compile(
+    r"sentiment\s*[:：]\s*\[?\s*(positive|negative|neutral)|المشاعر\s*[:：]\s*\[?\s*(إيجابي|سلبي|محايد)",
+    re.IGNORECASE
+)
+_CONFIDENCE_RE = re.compile(r"(?:confidence|الثقة)\s*[:：]\s*\[?\s*([0-9]*\.?[0-9]+)", re.IGNORECASE)
+_SENTIMENT_LABELS = {
+    "positive": "positive", "negative": "negative", "neutral": "neutral",
+    "إيجابي": "positive", "سلبي": "negative", "محايد": "neutral"
+}
+
+# Rough characters per token when tiktoken is unavailable; Arabic script
+# tokenizes much more densely than English
+_CHARS_PER_TOKEN = {'en': 4, 'ar': 2}
+
+# Unsplash Source categories per image type (nature, city, technology, ...)
+_UNSPLASH_CATEGORIES = {
+    "technology": "technology",
+    "nature": "nature",
+    "science": "technology",
+    "business": "business",
+    "education": "education",
+    "general": "abstract"
+}
+
+# Icon search terms per normalized department code (upper case, spaces as
+# underscores); read-only and shared by every request
+_DEPT_ICON_MAP = MappingProxyType({
+    'IT': 'technology computer server',
+    'HR': 'human resources people team',
+    'FINANCE': 'finance money accounting calculator',
+    'MARKETING': 'marketing advertising megaphone',
+    'SALES': 'sales business handshake',
+    'OPERATIONS': 'operations management gear',
+    'LEGAL': 'legal law justice scales',
+    'ADMIN': 'administration office building',
+    'RESEARCH': 'research science laboratory microscope',
+    'DEVELOPMENT': 'development engineering tools',
+    'SUPPORT': 'customer support service headset',
+    'SECURITY': 'security shield protection lock'
+})
+
+# Common department code abbreviations, matched exactly
+_DEPT_CODE_ALIASES = MappingProxyType({
+    'FIN': 'FINANCE',
+    'MKT': 'MARKETING',
+    'OPS': 'OPERATIONS',
+    'R&D': 'RESEARCH',
+    'DEV': 'DEVELOPMENT',
+})
+
+# Lower-case department names and their codes, in match priority order
+_DEPT_MAPPINGS = (
+    ('information technology', 'IT'),
+    ('human resources', 'HR'),
+    ('finance', 'FIN'),
+    ('marketing', 'MKT'),
+    ('sales', 'SAL'),
+    ('operations', 'OPS'),
+    ('legal', 'LEG'),
+    ('administration', 'ADM'),
+    ('research', 'R&D'),
+    ('development', 'DEV'),
+    ('support', 'SUP'),
+    ('security', 'SEC')
+)
+
+_DEPT_CODES = MappingProxyType(dict(_DEPT_MAPPINGS))
+
+
+def _keyword_index(keywords):
+    """
+    Compile keywords for substring search in a single regex pass
+
+    The lookahead makes matches overlap, so a keyword inside another one
+    (e.g. 'IT' in 'SECURITY') is still found, as with `keyword in text`.
+    Returns (pattern, keyword -> priority).
+    """
+    pattern = re.compile('(?=(%s))' % '|'.join(re.escape(keyword) for keyword in keywords))
+    return pattern, MappingProxyType({keyword: i for i, keyword in enumerate(keywords)})
+
+
+def _first_keyword(index, text: str) -> Optional[int]:
+    """Priority of the earliest-listed keyword found in text, or None"""
+    pattern, priority = index
+    return min((priority[match.group(1)] for match in pattern.finditer(text)), default=None)
+
+
+# Keyword indexes for the department name and icon substring fallbacks,
+# lower-cased where they are matched against lower-cased text
+_DEPT_NAME_INDEX = _keyword_index([key for key, _ in _DEPT_MAPPINGS])
+_DEPT_ICON_CODE_INDEX = _keyword_index(list(_DEPT_ICON_MAP))
+_DEPT_ICON_NAME_INDEX = _keyword_index([key.lower() for key in _DEPT_ICON_MAP])
+_DEPT_ICON_CATEGORIES = tuple(_DEPT_ICON_MAP.values())
+
+# Full department names per code
+_DEPT_NAMES_EN = MappingProxyType({
+    'IT': 'Information Technology',
+    'HR': 'Human Resources',
+    'FIN': 'Finance',
+    'MKT': 'Marketing',
+    'SAL': 'Sales',
+    'OPS': 'Operations',
+    'LEG': 'Legal Affairs',
+    'ADM': 'Administration',
+    'R&D': 'Research and Development',
+    'DEV': 'Development',
+    'SUP': 'Support',
+    'SEC': 'Security'
+})
+_DEPT_NAMES_AR = MappingProxyType({
+    'IT': 'تكنولوجيا المعلومات',
+    'HR': 'الموارد البشرية',
+    'FIN': 'المالية',
+    'MKT': 'التسويق',
+    'SAL': 'المبيعات',
+    'OPS': 'العمليات',
+    'LEG': 'الشؤون القانونية',
+    'ADM': 'الإدارة',
+    'R&D': 'البحث والتطوير',
+    'DEV': 'التطوير',
+    'SUP': 'الدعم',
+    'SEC': 'الأمن'
+})
+
+# Image lookups are network-bound, so they run concurrently on a sized pool
+_IMG_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="image-search")
+
+# Static text for fallback articles, formatted with {query} and the article
+# number {n}; only the placeholders are filled in per call
+_FALLBACK_ARTICLE_TEMPLATES = {
+    'ar': {
+        "title": "مقال شامل حول {query} - الجزء {n}",
+        "snippet": "هذا مقال تفصيلي يتناول موضوع {query} من زوايا متعددة. يقدم المقال تحليلاً عميقاً للموضوع مع استعراض الجوانب المختلفة والتطورات الحديثة. يهدف هذا المحتوى إلى تقديم فهم شامل للقارئ حول {query} وتأثيراته على المجتمع والاقتصاد. كما يستكشف المقال التحديات والفرص المرتبطة بهذا الموضوع، ويقدم رؤى من خبراء مختصين في المجال. المقال مدعوم بأمثلة عملية ودراسات حالة توضح التطبيقات الواقعية للموضوع.",
+        "category": {
+            "name": "تكنولوجيا ومعلومات",
+            "description": "فئة شاملة تغطي أحدث التطورات في مجال التكنولوجيا والمعلومات. تشمل هذه الفئة مواضيع متنوعة مثل الذكاء الاصطناعي، والحوسبة السحابية، وأمن المعلومات، والتطبيقات الذكية. تهدف إلى تقديم محتوى عالي الجودة يساعد القراء على فهم التقنيات الحديثة وتأثيرها على حياتنا اليومية. كما تتناول التحديات والفرص في عالم التكنولوجيا المتطور.",
+            "wikipedia_link": "https://ar.wikipedia.org/wiki/تكنولوجيا_المعلومات"
+        },
+        "category_image_query": "تكنولوجيا المعلومات",
+        "author_name": "د. أحمد محمد الخبير {n}",
+        "author_profession": "كاتب وباحث في التكنولوجيا",
+        "author_description": "خبير متخصص في مجال التكنولوجيا والابتكار مع خبرة تزيد عن 15 عاماً في البحث والكتابة. حاصل على درجة الدكتوراه في علوم الحاسوب ومؤلف لعدة كتب في مجال التكنولوجيا. يعمل كمستشار تقني لعدة شركات ومؤسسات، ويساهم بانتظام في المؤتمرات العلمية والمجلات المتخصصة.",
+        "author_wikipedia_link": "https://ar.wikipedia.org/wiki/أحمد_محمد_الخبير_{n}",
+        "content": "محتوى مفصل حول {query}...",
+        "summary": "ملخص شامل للمقال حول {query} يغطي النقاط الرئيسية والاستنتاجات المهمة."
+    },
+    'en': {
+        "title": "Comprehensive Article on {query} - Part {n}",
+        "snippet": "This detailed article explores the topic of {query} from multiple perspectives. It provides in-depth analysis of the subject matter, covering various aspects and recent developments. The content aims to give readers a comprehensive understanding of {query} and its implications for society and economy. The article also examines challenges and opportunities related to this topic, offering insights from field experts. It is supported by practical examples and case studies that illustrate real-world applications of the subject matter. The piece is designed to be both informative and accessible to readers with varying levels of expertise.",
+        "category": {
+            "name": "Technology & Innovation",
+            "description": "A comprehensive category covering the latest developments in technology and innovation. This category encompasses diverse topics including artificial intelligence, cloud computing, cybersecurity, and smart applications. It aims to provide high-quality content that helps readers understand modern technologies and their impact on our daily lives. The category also addresses challenges and opportunities in the evolving world of technology, featuring expert analysis and forward-looking perspectives on technological trends.",
+            "wikipedia_link": "https://en.wikipedia.org/wiki/Technology"
+        },
+        "category_image_query": "Technology Innovation",
+        "author_name": "Dr. Sarah Johnson Expert {n}",
+        "author_profession": "technology writer and researcher",
+        "author_description": "A specialized expert in technology and innovation with over 15 years of experience in research and writing. Holds a Ph.D. in Computer Science and is the author of several books on technology. Works as a technical consultant for various companies and institutions, regularly contributing to scientific conferences and specialized journals. Known for making complex technological concepts accessible to general audiences.",
+        "author_wikipedia_link": "https://en.wikipedia.org/wiki/Sarah_Johnson_Expert_{n}",
+        "content": "Detailed content about {query}...",
+        "summary": "Comprehensive summary of the article on {query} covering key points and important conclusions."
+    }
+}
+
+# Generated department info changes rarely; keep it for six hours
+_DEPARTMENT_INFO_TTL = 6 * 3600
+
+# Static text for fallback department info; %s is the department name
+_FALLBACK_DEPARTMENT_TEMPLATES = {
+    'ar': {
+        "description": "قسم %s هو أحد الأقسام المهمة في المؤسسة، يتولى مسؤوليات متعددة ومتنوعة تساهم في تحقيق أهداف المنظمة. يعمل هذا القسم على تطوير وتنفيذ الاستراتيجيات والسياسات المتعلقة بمجال تخصصه، ويضم فريقاً من المختصين والخبراء ذوي الكفاءة العالية. يسعى القسم إلى تحقيق التميز في الأداء وتقديم أفضل الخدمات للعملاء الداخليين والخارجيين، مع الحرص على مواكبة أحدث التطورات والتقنيات في مجال عمله.",
+        "first_responsibility": "إدارة وتنسيق أنشطة %s",
+        "responsibilities": (
+            "تطوير السياسات والإجراءات",
+            "ضمان الجودة والامتثال للمعايير",
+            "التدريب وتطوير الموظفين",
+            "إعداد التقارير والتحليلات"
+        ),
+        "objectives": (
+            "تحقيق الأهداف الاستراتيجية للمؤسسة",
+            "تحسين الكفاءة والإنتاجية",
+            "ضمان رضا العملاء",
+            "التطوير المستمر للعمليات",
+            "الابتكار والتميز في الأداء"
+        ),
+        "language": "ar"
+    },
+    'en': {
+        "description": "The %s department is a vital component of the organization, responsible for multiple and diverse functions that contribute to achieving organizational goals. This department develops and implements strategies and policies related to its area of expertise, comprising a team of qualified specialists and experts with high competency. The department strives to achieve excellence in performance and deliver the best services to internal and external customers, while keeping pace with the latest developments and technologies in its field of work. It plays a crucial role in organizational success through effective management, strategic planning, and continuous improvement initiatives.",
+        "first_responsibility": "Managing and coordinating %s activities",
+        "responsibilities": (
+            "Developing policies and procedures",
+            "Ensuring quality and compliance with standards",
+            "Training and staff development",
+            "Preparing reports and analyses"
+        ),
+        "objectives": (
+            "Achieve organizational strategic goals",
+            "Improve efficiency and productivity",
+            "Ensure customer satisfaction",
+            "Continuous process improvement",
+            "Innovation and performance excellence"
+        ),
+        "language": "en"
+    }
+}
 
 class GroqLLMService:
     """Service for Groq LLM operations including summarization and translation"""
 
+    # Per-process circuit breaker for the scraped image sources: after
+    # _SOURCE_MAX_FAILURES consecutive failures a source is skipped for
+    # _SOURCE_COOLDOWN seconds instead of waiting out its timeout every call
+    _SOURCE_MAX_FAILURES = 5
+    _SOURCE_COOLDOWN = 300
+    _source_failures = {"google": 0, "britannica": 0, "unsplash": 0}
+    _source_open_until = {"google": 0.0, "britannica": 0.0, "unsplash": 0.0}
+    _source_lock = threading.Lock()
+
+    # Prompt skeletons keyed by (kind, language); kept compact since every
+    # character is billed as input tokens
+    _PROMPTS = {
+        ("summarize", "ar"): "قم بتلخيص المقال التالي باللغة العربية في حوالي {max_length} كلمة. اجعل الملخص واضحاً ومفيداً ويغطي النقاط الرئيسية:\n\n{text}\n\nالملخص:",
+        ("summarize", "en"): "Please summarize the following article in approximately {max_length} words. Make the summary clear, informative, and cover the main points:\n\n{text}\n\nSummary:",
+        ("translate", "ar"): "ترجم النص التالي إلى اللغة العربية بدقة مع الحفاظ على المعنى الأصلي:\n\n{text}\n\nالترجمة:",
+        ("translate", "en"): "Translate the following text to English accurately while preserving the original meaning:\n\n{text}\n\nTranslation:",
+        ("keywords", "ar"): "استخرج أهم {max_keywords} كلمات مفتاحية من النص التالي. أرجع الكلمات المفتاحية كقائمة مفصولة بفواصل:\n\n{text}\n\nالكلمات المفتاحية:",
+        ("keywords", "en"): "Extract the top {max_keywords} most important keywords from the following text. Return the keywords as a comma-separated list:\n\n{text}\n\nKeywords:",
+        ("sentiment", "ar"): "حلل المشاعر في النص التالي وأرجع النتيجة بالتنسيق التالي:\nالمشاعر: [إيجابي/سلبي/محايد]\nالثقة: [رقم من 0 إلى 1]\nالتفسير: [تفسير قصير]\n\nالنص:\n{text}",
+        ("sentiment", "en"): "Analyze the sentiment of the following text and return the result in this format:\nSentiment: [positive/negative/neutral]\nConfidence: [number from 0 to 1]\nExplanation: [brief explanation]\n\nText:\n{text}",
+    }
+
+    # Input token budget per prompt kind (previously 4000/3000/2000/1500 chars)
+    _INPUT_TOKENS = {"summarize": 1000, "translate": 750, "keywords": 500, "sentiment": 375}
+
     def __init__(self):
-        self.client = Groq(api_key=settings.GROQ_API_KEY)
-        self.model = "llama3-8b-8192"  # Default Groq model
+        # The SDK retries 408/409/429/5xx with exponential backoff and jitter,
+        # honouring retry-after headers; max_retries sets how persistent it is
+        self.client = Groq(
+            api_key=settings.GROQ_API_KEY,
+            max_retries=settings.GROQ_MAX_RETRIES,
+            http_client=httpx.Client(limits=_GROQ_LIMITS, timeout=_GROQ_TIMEOUT)
+        )
+        self.aclient = AsyncGroq(
+            api_key=settings.GROQ_API_KEY,
+            max_retries=settings.GROQ_MAX_RETRIES,
+            http_client=httpx.AsyncClient(limits=_GROQ_LIMITS, timeout=_GROQ_TIMEOUT)
+        )
+        # Outages and exhausted rate-limit retries trip the breaker; rejected
+        # requests (4xx) mean Groq is up and do not
+        self.breaker = CircuitBreaker(
+            "groq",
+            max_failures=settings.GROQ_BREAKER_MAX_FAILURES,
+            reset_timeout=settings.GROQ_BREAKER_RESET_TIMEOUT,
+            is_failure=lambda exc: isinstance(exc, (APIConnectionError, InternalServerError, RateLimitError))
+        )
+        self.model = "llama-3.1-8b-instant"  # Default Groq model (supports JSON mode)
+        self.max_concurrency = 16  # Concurrent requests per batch, keeps us under Groq rate limits
+        self.stats = {"cache_hits": 0, "cache_misses": 0}
+        self._stats_lock = threading.Lock()  # the service is shared by request threads
+
+    def create_chat_completion(self, **kwargs):
+        """
+        Call chat.completions.create through the Groq circuit breaker
+
+        Raises:
+            CircuitOpenError: Groq has been failing and the call was not made
+        """
+        return self.breaker.call(self.client.chat.completions.create, **kwargs)
+
+    def _cached_complete(self, prompt: str, *, max_tokens: int, temperature: float, ttl: int = 86400) -> str:
+        """
+        Run a chat completion, reusing a cached response for an identical prompt
+
+        Responses are cached by model, temperature, max_tokens and prompt.
+        High-temperature (creative) prompts are never cached. A cache backend
+        error counts as a miss, and the completion is then not stored.
+
+        Returns:
+            The stripped completion text
+        """
+        cacheable = temperature <= 0.5
+        if cacheable:
+            key = "groq:" + hashlib.sha256(
+                f"{self.model}|{temperature}|{max_tokens}|{prompt}".encode('utf-8')
+            ).hexdigest()
+            try:
+                cached = cache.get(key)
+            except Exception:
+                logger.warning("Completion cache read failed, treating as a miss", exc_info=True)
+                cached = None
+            stat = "cache_hits" if cached is not None else "cache_misses"
+            with self._stats_lock:
+                self.stats[stat] += 1
+            if cached is not None:
+                return cached
+
+        response = self.create_chat_completion(
+            messages=[
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        result = response.choices[0].message.content.strip()
+
+        if cacheable:
+            try:
+                cache.set(key, result, ttl)
+            except Exception:
+                logger.warning("Completion cache write failed, result not cached", exc_info=True)
+        return result
+
+    def _truncate_to_tokens(self, text: str, max_tokens: int, language: str = 'en') -> str:
+        """
+        Trim text to roughly max_tokens tokens
+
+        Uses tiktoken when it is installed; it is not the Llama tokenizer, but it
+        is close enough for a budget. Otherwise falls back to a per-language
+        characters-per-token estimate.
+        """
+        encoding = _token_encoding()
+        if encoding is not None:
+            tokens = encoding.encode(text)
+            if len(tokens) <= max_tokens:
+                return text
+            logger.debug("Trimmed prompt input from %d to %d tokens", len(tokens), max_tokens)
+            return encoding.decode(tokens[:max_tokens])
+        chars_per_token = _CHARS_PER_TOKEN.get(language, 4)
+        if len(text) > max_tokens * chars_per_token:
+            logger.debug("Trimmed prompt input from ~%d to ~%d tokens", len(text) // chars_per_token, max_tokens)
+        return text[:max_tokens * chars_per_token]
+
+    def _build_prompt(self, kind: str, text: str, language: str, **kwargs) -> str:
+        """
+        Build a prompt from the shared templates
+
+        Args:
+            kind: Prompt kind ('summarize', 'translate', 'keywords' or 'sentiment')
+            text: Input text, trimmed to the kind's token budget
+            language: Language of the prompt ('en' or 'ar')
+            **kwargs: Extra template fields (e.g. max_length, max_keywords)
+
+        Returns:
+            The formatted prompt
+        """
+        template = self._PROMPTS[(kind, 'ar' if language == 'ar' else 'en')]
+        text = self._truncate_to_tokens(text, self._INPUT_TOKENS[kind], language)
+        return template.format(text=text, **kwargs)
+
+    async def _acomplete(self, prompt: str, max_tokens: int, temperature: float, client: AsyncGroq = None) -> str:
+        """Run a single chat completion on the async client and return the stripped text"""
+        client = client or self.aclient
+        response = await self.breaker.acall(
+            client.chat.completions.create,
+            messages=[
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        return response.choices[0].message.content.strip()
+
+    async def _agather(self, prompts: List[str], max_tokens: int, temperature: float, client: AsyncGroq = None) -> List[Any]:
+        """
+        Run completions for all prompts concurrently
+
+        Returns one entry per prompt, in order: the completion text or the
+        exception raised for that prompt. Identical prompts are sent once and
+        share the response.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        unique_prompts = list(dict.fromkeys(prompts))
+
+        async def complete(prompt):
+            async with semaphore:
+                return await self._acomplete(prompt, max_tokens, temperature, client=client)
+
+        results = await asyncio.gather(*(complete(prompt) for prompt in unique_prompts), return_exceptions=True)
+        by_prompt = dict(zip(unique_prompts, results))
+        return [by_prompt[prompt] for prompt in prompts]
+
+    def _run_batch(self, batch):
+        """
+        Run an async batch from synchronous code (e.g. Django views)
+
+        The batch gets its own AsyncGroq client because async_to_sync runs it in
+        a fresh event loop, and pooled connections cannot cross event loops.
+        """
+        async def runner():
+            async with AsyncGroq(api_key=settings.GROQ_API_KEY, max_retries=settings.GROQ_MAX_RETRIES) as client:
+                return await batch(client)
+
+        return async_to_sync(runner)()
+
+    async def asummarize_articles(self, texts: List[str], language: str = 'en', max_length: int = 200,
+                                  client: AsyncGroq = None) -> List[Optional[str]]:
+        """
+        Summarize several articles concurrently
+
+        Args:
+            texts: Article texts to summarize
+            language: Target language for the summaries ('en' or 'ar')
+            max_length: Maximum length of each summary in words
+            client: Async client to use (defaults to the service client)
+
+        Returns:
+            One summary per text, None where generation failed
+        """
+        indexes = [i for i, text in enumerate(texts) if text and len(text.strip()) >= 50]
+        prompts = [self._build_prompt('summarize', texts[i], language, max_length=max_length) for i in indexes]
+        results = await self._agather(prompts, max_tokens=500, temperature=0.3, client=client)
+
+        summaries = ["Text too short to summarize"] * len(texts)
+        for i, result in zip(indexes, results):
+            if isinstance(result, Exception):
+                logger.error("Error in asummarize_articles", exc_info=result)
+                result = None
+            summaries[i] = result
+        return summaries
+
+    async def atranslate_texts(self, texts: List[str], target_language: str,
+                               client: AsyncGroq = None) -> List[Optional[str]]:
+        """
+        Translate several texts concurrently
+
+        Args:
+            texts: Texts to translate
+            target_language: Target language ('en' or 'ar')
+            client: Async client to use (defaults to the service client)
+
+        Returns:
+            One translation per text, None where translation failed
+        """
+        prompts = [self._build_prompt('translate', text, target_language) for text in texts]
+        results = await self._agather(prompts, max_tokens=1000, temperature=0.2, client=client)
+
+        translations = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Error in atranslate_texts", exc_info=result)
+                result = None
+            translations.append(result)
+        return translations
+
+    def _stream_complete(self, prompt: str, max_tokens: int, temperature: float) -> Iterator[str]:
+        """Run a streaming chat completion and yield text deltas as they arrive"""
+        stream = self.create_chat_completion(
+            messages=[
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True
+        )
+        for chunk in stream:
+            if chunk.choices:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+
+    def stream_articles(self, query: str, language: str = 'en', max_results: int = 5) -> Iterator[str]:
+        """
+        Stream the raw JSON text of generated articles as it is produced
+
+        The concatenated fragments form the same JSON that
+        generate_article_search_results parses; callers forward them to the
+        client before generation ends, then pass the full text to
+        articles_from_text.
+
+        Yields:
+            Raw completion text fragments, in order
+        """
+        prompt = self._build_articles_prompt(query, language, max_results)
+        yield from self._stream_complete(prompt, max_tokens=4000, temperature=0.7)
+
+    def articles_from_text(self, result_text: str, query: str, language: str = 'en',
+                           max_results: int = 5) -> List[Dict[str, Any]]:
+        """
+        Turn the concatenated output of stream_articles into search results
+
+        Streaming runs without JSON mode, so text that does not parse (or holds
+        no articles) yields the fallback articles instead.
+
+        Returns:
+            The same results generate_article_search_results would return
+        """
+        try:
+            articles = self._parse_articles(result_text)
+        except json.JSONDecodeError:
+            articles = []
+        if not articles:
+            return self._create_fallback_articles(query, language, max_results)
+        return self._finalize_articles(articles, query)[:max_results]
+
+    def summarize_batch(self, texts: List[str], language: str = 'en', max_length: int = 200) -> List[Optional[str]]:
+        """Synchronous wrapper around asummarize_articles"""
+        return self._run_batch(lambda client: self.asummarize_articles(texts, language, max_length, client=client))
+
+    def translate_batch(self, texts: List[str], target_language: str) -> List[Optional[str]]:
+        """Synchronous wrapper around atranslate_texts"""
+        return self._run_batch(lambda client: self.atranslate_texts(texts, target_language, client=client))
     
     def summarize_article(self, text: str, language: str = 'en', max_length: int = 200) -> Optional[str]:
         """
@@ -30,43 +579,13 @@ class GroqLLMService:
             if not text or len(text.strip()) < 50:
                 return "Text too short to summarize"
             
-            # Prepare prompt based on language
-            if language == 'ar':
-                prompt = f"""
-                قم بتلخيص المقال التالي باللغة العربية في حوالي {max_length} كلمة. 
-                اجعل الملخص واضحاً ومفيداً ويغطي النقاط الرئيسية:
-
-                {text[:4000]}  # Limit text to avoid token limits
-                
-                الملخص:
-                """
-            else:
-                prompt = f"""
-                Please summarize the following article in approximately {max_length} words. 
-                Make the summary clear, informative, and cover the main points:
+            prompt = self._build_prompt('summarize', text, language, max_length=max_length)
 
-                {text[:4000]}  # Limit text to avoid token limits
-                
-                Summary:
-                """
-            
-            response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model=self.model,
-                max_tokens=500,
-                temperature=0.3
-            )
-            
-            summary = response.choices[0].message.content.strip()
+            summary = self._cached_complete(prompt, max_tokens=500, temperature=0.3)
             return summary
             
-        except Exception as e:
-            print(f"Error in summarize_article: {str(e)}")
+        except Exception:
+            logger.exception("Error in summarize_article")
             return None
     
     def translate_text(self, text: str, target_language: str) -> Optional[str]:
@@ -81,40 +600,13 @@ class GroqLLMService:
             Translated text or None if failed
         """
         try:
-            if target_language == 'ar':
-                prompt = f"""
-                ترجم النص التالي إلى اللغة العربية بدقة مع الحفاظ على المعنى الأصلي:
-
-                {text[:3000]}
-                
-                الترجمة:
-                """
-            else:
-                prompt = f"""
-                Translate the following text to English accurately while preserving the original meaning:
+            prompt = self._build_prompt('translate', text, target_language)
 
-                {text[:3000]}
-                
-                Translation:
-                """
-            
-            response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model=self.model,
-                max_tokens=1000,
-                temperature=0.2
-            )
-            
-            translation = response.choices[0].message.content.strip()
+            translation = self._cached_complete(prompt, max_tokens=1000, temperature=0.2)
             return translation
             
-        except Exception as e:
-            print(f"Error in translate_text: {str(e)}")
+        except Exception:
+            logger.exception("Error in translate_text")
             return None
     
     def extract_keywords(self, text: str, language: str = 'en', max_keywords: int = 10) -> list:
@@ -130,44 +622,15 @@ class GroqLLMService:
             List of keywords
         """
         try:
-            if language == 'ar':
-                prompt = f"""
-                استخرج أهم {max_keywords} كلمات مفتاحية من النص التالي. 
-                أرجع الكلمات المفتاحية كقائمة مفصولة بفواصل:
-
-                {text[:2000]}
-                
-                الكلمات المفتاحية:
-                """
-            else:
-                prompt = f"""
-                Extract the top {max_keywords} most important keywords from the following text. 
-                Return the keywords as a comma-separated list:
+            prompt = self._build_prompt('keywords', text, language, max_keywords=max_keywords)
 
-                {text[:2000]}
-                
-                Keywords:
-                """
-            
-            response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model=self.model,
-                max_tokens=200,
-                temperature=0.3
-            )
-            
-            keywords_text = response.choices[0].message.content.strip()
+            keywords_text = self._cached_complete(prompt, max_tokens=200, temperature=0.3)
             # Parse keywords from response
             keywords = [kw.strip() for kw in keywords_text.split(',') if kw.strip()]
             return keywords[:max_keywords]
             
-        except Exception as e:
-            print(f"Error in extract_keywords: {str(e)}")
+        except Exception:
+            logger.exception("Error in extract_keywords")
             return []
     
     def analyze_sentiment(self, text: str, language: str = 'en') -> Dict[str, Any]:
@@ -182,51 +645,25 @@ class GroqLLMService:
             Dictionary with sentiment analysis results
         """
         try:
-            if language == 'ar':
-                prompt = f"""
-                حلل المشاعر في النص التالي وأرجع النتيجة بالتنسيق التالي:
-                المشاعر: [إيجابي/سلبي/محايد]
-                الثقة: [رقم من 0 إلى 1]
-                التفسير: [تفسير قصير]
+            prompt = self._build_prompt('sentiment', text, language)
 
-                النص:
-                {text[:1500]}
-                """
-            else:
-                prompt = f"""
-                Analyze the sentiment of the following text and return the result in this format:
-                Sentiment: [positive/negative/neutral]
-                Confidence: [number from 0 to 1]
-                Explanation: [brief explanation]
-
-                Text:
-                {text[:1500]}
-                """
+            result_text = self._cached_complete(prompt, max_tokens=300, temperature=0.2)
             
-            response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model=self.model,
-                max_tokens=300,
-                temperature=0.2
-            )
-            
-            result_text = response.choices[0].message.content.strip()
-            
-            # Parse the response (basic parsing)
+            # Parse the labelled "Sentiment:" / "Confidence:" lines
             sentiment = "neutral"
             confidence = 0.5
             explanation = result_text
-            
-            if "positive" in result_text.lower() or "إيجابي" in result_text:
-                sentiment = "positive"
-            elif "negative" in result_text.lower() or "سلبي" in result_text:
-                sentiment = "negative"
-            
+
+            match = _SENTIMENT_RE.search(result_text)
+            if match:
+                sentiment = _SENTIMENT_LABELS[(match.group(1) or match.group(2)).lower()]
+            match = _CONFIDENCE_RE.search(result_text)
+            if match:
+                try:
+                    confidence = min(max(float(match.group(1)), 0.0), 1.0)
+                except ValueError:
+                    pass
+
             return {
                 "sentiment": sentiment,
                 "confidence": confidence,
@@ -234,14 +671,68 @@ class GroqLLMService:
             }
             
         except Exception as e:
-            print(f"Error in analyze_sentiment: {str(e)}")
+            logger.exception("Error in analyze_sentiment")
             return {
                 "sentiment": "neutral",
                 "confidence": 0.0,
                 "explanation": f"Analysis failed: {str(e)}"
             }
 
-    def generate_article_search_results(self, query: str, language: str = 'en', max_results: int = 5) -> List[Dict[str, Any]]:
+    def _build_articles_prompt(self, query: str, language: str, count: int) -> str:
+        """Build the prompt asking the LLM for `count` articles about `query`"""
+        if language == 'ar':
+            return f"""
+            أنشئ {count} مقالات تفصيلية حول موضوع "{query}". لكل مقال، قدم:
+
+            1. العنوان (جذاب ومناسب)
+            2. ملخص طويل (أكثر من 200 كلمة)
+            3. الفئة مع: الاسم، وصف مفصل (أكثر من 200 كلمة)، رابط ويكيبيديا، صورة وهمية
+            4. المؤلف مع: الاسم، المهنة، وصف مفصل، رابط ويكيبيديا، صورة وهمية
+            5. المحتوى الكامل للمقال (أكثر من 500 كلمة)
+            6. ملخص شامل (200-300 كلمة)
+
+            أرجع النتيجة ككائن JSON صالح بالشكل {{"articles": [...]}} وبنفس مفاتيح المثال الإنجليزي:
+            id, title, snippet, category (name, description, wikipedia_link, image), author (name, profession, description, wikipedia_link, image), content, summary
+            """
+        return f"""
+            Generate {count} detailed articles about "{query}". For each article, provide:
+
+            1. Title (engaging and relevant)
+            2. Long snippet (more than 200 words)
+            3. Category with: name, detailed description (200+ words), wikipedia link, image URL
+            4. Author with: name, profession, detailed description, wikipedia link, image URL
+            5. Full article content (500+ words)
+            6. Comprehensive summary (200-300 words)
+
+            Return the result as a valid JSON object:
+            {{
+              "articles": [
+              {{
+                "id": "unique-uuid",
+                "title": "Article Title",
+                "snippet": "Long detailed snippet...",
+                "category": {{
+                  "name": "Category Name",
+                  "description": "Detailed category description...",
+                  "wikipedia_link": "https://en.wikipedia.org/wiki/Category_Name",
+                  "image": "https://example.com/category-image.jpg"
+                }},
+                "author": {{
+                  "name": "Author Name",
+                  "profession": "writer/journalist/researcher/etc",
+                  "description": "Detailed author bio...",
+                  "wikipedia_link": "https://en.wikipedia.org/wiki/Author_Name",
+                  "image": "https://example.com/author-image.jpg"
+                }},
+                "content": "Full article content...",
+                "summary": "Comprehensive summary..."
+              }}
+              ]
+            }}
+            """
+
+    def generate_article_search_results(self, query: str, language: str = 'en', max_results: int = 5,
+                                        batch: Optional[bool] = None) -> List[Dict[str, Any]]:
         """
         Generate comprehensive article search results using LLM
 
@@ -249,61 +740,24 @@ class GroqLLMService:
             query: Search query
             language: Target language ('en' or 'ar')
             max_results: Maximum number of results to generate
+            batch: Generate through the Groq Batch API (cheaper, but may take
+                minutes). Defaults to the GROQ_USE_BATCH_API setting; meant for
+                offline jobs, not request handlers.
 
         Returns:
             List of generated article results with detailed content
         """
         try:
-            if language == 'ar':
-                prompt = f"""
-                أنشئ {max_results} مقالات تفصيلية حول موضوع "{query}". لكل مقال، قدم:
+            use_batch = settings.GROQ_USE_BATCH_API if batch is None else batch
+            if use_batch:
+                articles = self._generate_articles_via_batch(query, language, max_results)
+                if articles:
+                    return self._finalize_articles(articles, query)[:max_results]
+                # Batch did not finish in time, fall through to a real-time completion
 
-                1. العنوان (جذاب ومناسب)
-                2. ملخص طويل (أكثر من 200 كلمة)
-                3. الفئة مع: الاسم، وصف مفصل (أكثر من 200 كلمة)، رابط ويكيبيديا، صورة وهمية
-                4. المؤلف مع: الاسم، المهنة، وصف مفصل، رابط ويكيبيديا، صورة وهمية
-                5. المحتوى الكامل للمقال (أكثر من 500 كلمة)
-                6. ملخص شامل (200-300 كلمة)
-
-                أرجع النتيجة بتنسيق JSON صالح:
-                """
-            else:
-                prompt = f"""
-                Generate {max_results} detailed articles about "{query}". For each article, provide:
-
-                1. Title (engaging and relevant)
-                2. Long snippet (more than 200 words)
-                3. Category with: name, detailed description (200+ words), wikipedia link, image URL
-                4. Author with: name, profession, detailed description, wikipedia link, image URL
-                5. Full article content (500+ words)
-                6. Comprehensive summary (200-300 words)
-
-                Return the result in valid JSON format:
-                [
-                  {{
-                    "id": "unique-uuid",
-                    "title": "Article Title",
-                    "snippet": "Long detailed snippet...",
-                    "category": {{
-                      "name": "Category Name",
-                      "description": "Detailed category description...",
-                      "wikipedia_link": "https://en.wikipedia.org/wiki/Category_Name",
-                      "image": "https://example.com/category-image.jpg"
-                    }},
-                    "author": {{
-                      "name": "Author Name",
-                      "profession": "writer/journalist/researcher/etc",
-                      "description": "Detailed author bio...",
-                      "wikipedia_link": "https://en.wikipedia.org/wiki/Author_Name",
-                      "image": "https://example.com/author-image.jpg"
-                    }},
-                    "content": "Full article content...",
-                    "summary": "Comprehensive summary..."
-                  }}
-                ]
-                """
+            prompt = self._build_articles_prompt(query, language, max_results)
 
-            response = self.client.chat.completions.create(
+            response = self.create_chat_completion(
                 messages=[
                     {
                         "role": "user",
@@ -312,113 +766,265 @@ class GroqLLMService:
                 ],
                 model=self.model,
                 max_tokens=4000,
-                temperature=0.7
+                temperature=0.7,
+                response_format={"type": "json_object"}
             )
 
-            result_text = response.choices[0].message.content.strip()
+            # JSON mode guarantees a parseable object
+            articles = self._parse_articles(response.choices[0].message.content)
+            return self._finalize_articles(articles, query)[:max_results]
 
-            # Try to parse JSON response
-            try:
-                articles = json.loads(result_text)
-                if not isinstance(articles, list):
-                    articles = [articles]
+        except CircuitOpenError:
+            return self._create_fallback_articles(query, language, max_results)
+        except Exception:
+            logger.exception("Error in generate_article_search_results")
+            return self._create_fallback_articles(query, language, max_results)
 
-                # Ensure each article has a unique ID and real images
-                for article in articles:
-                    if 'id' not in article:
-                        article['id'] = str(uuid.uuid4())
+    def _parse_articles(self, result_text: str) -> List[Dict[str, Any]]:
+        """Extract the article list from a JSON-mode {"articles": [...]} response"""
+        parsed = loads(result_text)
+        if isinstance(parsed, dict):
+            parsed = parsed.get("articles", [parsed])
+        if not isinstance(parsed, list):
+            parsed = [parsed]
+        return [article for article in parsed if isinstance(article, dict)]
+
+    def _finalize_articles(self, articles: List[Dict[str, Any]], query: str) -> List[Dict[str, Any]]:
+        """Ensure each generated article has a unique ID and real images"""
+        lookups = []
+        targets = []
+        for article in articles:
+            if 'id' not in article:
+                article['id'] = str(uuid.uuid4())
+
+            # Collect image lookups for category and author
+            category = article.get('category')
+            if isinstance(category, dict):
+                lookups.append((category.get('name', query), "category"))
+                targets.append(category)
+
+            author = article.get('author')
+            if isinstance(author, dict):
+                author_name = author.get('name', 'professional author')
+                lookups.append((f"{author_name} portrait", "person"))
+                targets.append(author)
+
+        # Get real images for all articles at once
+        for target, image in zip(targets, self.search_for_reliable_images(lookups)):
+            target['image'] = image
 
-                    # Get real images for category and author
-                    if 'category' in article and isinstance(article['category'], dict):
-                        category_name = article['category'].get('name', query)
-                        article['category']['image'] = self.search_for_reliable_image(category_name, "category")
+        return articles
 
-                    if 'author' in article and isinstance(article['author'], dict):
-                        author_name = article['author'].get('name', 'professional author')
-                        article['author']['image'] = self.search_for_reliable_image(f"{author_name} portrait", "person")
+    def _generate_articles_via_batch(self, query: str, language: str, max_results: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Generate articles one per prompt through the Groq Batch API
 
-                return articles[:max_results]
+        Returns the parsed articles, or None if the batch did not complete
+        within GROQ_BATCH_TIMEOUT seconds. An unfinished batch is cancelled so
+        it does not keep running (and billing) after the real-time fallback.
+        """
+        prompts = [self._build_articles_prompt(query, language, 1) for _ in range(max_results)]
+        batch_id = self.submit_batch(prompts, max_tokens=1500, temperature=0.7, json_mode=True)
+        results = self.poll_batch(batch_id, timeout=settings.GROQ_BATCH_TIMEOUT)
+        if results is None:
+            try:
+                self.client.batches.cancel(batch_id)
+            except Exception:
+                logger.warning("Could not cancel Groq batch %s", batch_id, exc_info=True)
+            return None
 
+        articles = []
+        for result_text in results:
+            if not result_text:
+                continue
+            try:
+                articles.extend(self._parse_articles(result_text))
             except json.JSONDecodeError:
-                # Fallback: create structured articles from text response
-                return self._create_fallback_articles(query, language, max_results, result_text)
+                continue
+        return articles
 
-        except Exception as e:
-            print(f"Error in generate_article_search_results: {str(e)}")
-            return self._create_fallback_articles(query, language, max_results)
+    def submit_batch(self, prompts: List[str], max_tokens: int = 1000, temperature: float = 0.7,
+                     json_mode: bool = False) -> str:
+        """
+        Submit prompts as a Groq batch job
+
+        Args:
+            prompts: Prompts to complete, one request each
+            max_tokens: Maximum tokens per completion
+            temperature: Sampling temperature
+            json_mode: Request JSON-mode (json_object) completions
+
+        Returns:
+            ID of the created batch
+        """
+        lines = []
+        for i, prompt in enumerate(prompts):
+            body = {
+                "model": self.model,
+                "messages": [
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                "max_tokens": max_tokens,
+                "temperature": temperature
+            }
+            if json_mode:
+                body["response_format"] = {"type": "json_object"}
+            lines.append(dumps({
+                "custom_id": f"request-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body
+            }))
+
+        batch_file = self.client.files.create(
+            file=("batch.jsonl", b"\n".join(lines)),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            completion_window="24h",
+            endpoint="/v1/chat/completions",
+            input_file_id=batch_file.id
+        )
+        return batch.id
+
+    def poll_batch(self, batch_id: str, timeout: float = 0, interval: float = 5) -> Optional[List[Optional[str]]]:
+        """
+        Wait for a batch to complete and return its completions
+
+        Args:
+            batch_id: ID returned by submit_batch
+            timeout: Seconds to wait for completion (0 checks once)
+            interval: Seconds between status checks
+
+        Returns:
+            Completion text per submitted prompt, in submission order (None for
+            failed requests), or None if the batch is not completed in time
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status == "completed":
+                break
+            if batch.status in ("failed", "expired", "cancelled") or time.monotonic() >= deadline:
+                return None
+            time.sleep(interval)
+
+        if not batch.output_file_id:
+            return None
+
+        output = self.client.files.content(batch.output_file_id).read()
+        results = {}
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            item = loads(line)
+            response = item.get("response") or {}
+            try:
+                content = response["body"]["choices"][0]["message"]["content"].strip()
+            except (KeyError, IndexError, TypeError):
+                content = None
+            results[item.get("custom_id")] = content
+
+        count = batch.request_counts.total if batch.request_counts else len(results)
+        return [results.get(f"request-{i}") for i in range(count)]
 
     def _create_fallback_articles(self, query: str, language: str, max_results: int, content: str = None) -> List[Dict[str, Any]]:
         """Create fallback articles when LLM generation fails"""
-        articles = []
+        template = _FALLBACK_ARTICLE_TEMPLATES['ar' if language == 'ar' else 'en']
+        author_names = [template["author_name"].format(n=i + 1) for i in range(max_results)]
+
+        # Every fallback article shares the same category, so its image is looked
+        # up once; all lookups run concurrently
+        lookups = [(template["category_image_query"], "category")]
+        lookups += [(name, "person") for name in author_names]
+        category_image, *author_images = self.search_for_reliable_images(lookups)
+
+        # Per-query text is the same for every article
+        snippet = template["snippet"].format(query=query)
+        content = content or template["content"].format(query=query)
+        summary = template["summary"].format(query=query)
+
+        return [
+            {
+                "id": str(uuid.uuid4()),
+                "title": template["title"].format(query=query, n=i + 1),
+                "snippet": snippet,
+                "category": {**template["category"], "image": category_image},
+                "author": {
+                    "name": author_names[i],
+                    "profession": template["author_profession"],
+                    "description": template["author_description"],
+                    "wikipedia_link": template["author_wikipedia_link"].format(n=i + 1),
+                    "image": author_images[i]
+                },
+                "content": content,
+                "summary": summary
+            }
+            for i in range(max_results)
+        ]
 
-        for i in range(max_results):
-            if language == 'ar':
-                article = {
-                    "id": str(uuid.uuid4()),
-                    "title": f"مقال شامل حول {query} - الجزء {i+1}",
-                    "snippet": f"هذا مقال تفصيلي يتناول موضوع {query} من زوايا متعددة. يقدم المقال تحليلاً عميقاً للموضوع مع استعراض الجوانب المختلفة والتطورات الحديثة. يهدف هذا المحتوى إلى تقديم فهم شامل للقارئ حول {query} وتأثيراته على المجتمع والاقتصاد. كما يستكشف المقال التحديات والفرص المرتبطة بهذا الموضوع، ويقدم رؤى من خبراء مختصين في المجال. المقال مدعوم بأمثلة عملية ودراسات حالة توضح التطبيقات الواقعية للموضوع.",
-                    "category": {
-                        "name": "تكنولوجيا ومعلومات",
-                        "description": "فئة شاملة تغطي أحدث التطورات في مجال التكنولوجيا والمعلومات. تشمل هذه الفئة مواضيع متنوعة مثل الذكاء الاصطناعي، والحوسبة السحابية، وأمن المعلومات، والتطبيقات الذكية. تهدف إلى تقديم محتوى عالي الجودة يساعد القراء على فهم التقنيات الحديثة وتأثيرها على حياتنا اليومية. كما تتناول التحديات والفرص في عالم التكنولوجيا المتطور.",
-                        "wikipedia_link": "https://ar.wikipedia.org/wiki/تكنولوجيا_المعلومات",
-                        "image": self.search_for_reliable_image("تكنولوجيا المعلومات", "category")
-                    },
-                    "author": {
-                        "name": f"د. أحمد محمد الخبير {i+1}",
-                        "profession": "كاتب وباحث في التكنولوجيا",
-                        "description": "خبير متخصص في مجال التكنولوجيا والابتكار مع خبرة تزيد عن 15 عاماً في البحث والكتابة. حاصل على درجة الدكتوراه في علوم الحاسوب ومؤلف لعدة كتب في مجال التكنولوجيا. يعمل كمستشار تقني لعدة شركات ومؤسسات، ويساهم بانتظام في المؤتمرات العلمية والمجلات المتخصصة.",
-                        "wikipedia_link": f"https://ar.wikipedia.org/wiki/أحمد_محمد_الخبير_{i+1}",
-                        "image": self.search_for_reliable_image(f"د. أحمد محمد الخبير {i+1}", "person")
-                    },
-                    "content": content or f"محتوى مفصل حول {query}...",
-                    "summary": f"ملخص شامل للمقال حول {query} يغطي النقاط الرئيسية والاستنتاجات المهمة."
-                }
-            else:
-                article = {
-                    "id": str(uuid.uuid4()),
-                    "title": f"Comprehensive Article on {query} - Part {i+1}",
-                    "snippet": f"This detailed article explores the topic of {query} from multiple perspectives. It provides in-depth analysis of the subject matter, covering various aspects and recent developments. The content aims to give readers a comprehensive understanding of {query} and its implications for society and economy. The article also examines challenges and opportunities related to this topic, offering insights from field experts. It is supported by practical examples and case studies that illustrate real-world applications of the subject matter. The piece is designed to be both informative and accessible to readers with varying levels of expertise.",
-                    "category": {
-                        "name": "Technology & Innovation",
-                        "description": "A comprehensive category covering the latest developments in technology and innovation. This category encompasses diverse topics including artificial intelligence, cloud computing, cybersecurity, and smart applications. It aims to provide high-quality content that helps readers understand modern technologies and their impact on our daily lives. The category also addresses challenges and opportunities in the evolving world of technology, featuring expert analysis and forward-looking perspectives on technological trends.",
-                        "wikipedia_link": "https://en.wikipedia.org/wiki/Technology",
-                        "image": self.search_for_reliable_image("Technology Innovation", "category")
-                    },
-                    "author": {
-                        "name": f"Dr. Sarah Johnson Expert {i+1}",
-                        "profession": "technology writer and researcher",
-                        "description": "A specialized expert in technology and innovation with over 15 years of experience in research and writing. Holds a Ph.D. in Computer Science and is the author of several books on technology. Works as a technical consultant for various companies and institutions, regularly contributing to scientific conferences and specialized journals. Known for making complex technological concepts accessible to general audiences.",
-                        "wikipedia_link": f"https://en.wikipedia.org/wiki/Sarah_Johnson_Expert_{i+1}",
-                        "image": self.search_for_reliable_image(f"Dr. Sarah Johnson Expert {i+1}", "person")
-                    },
-                    "content": content or f"Detailed content about {query}...",
-                    "summary": f"Comprehensive summary of the article on {query} covering key points and important conclusions."
-                }
+    def search_for_reliable_images(self, lookups: List[Tuple[str, str]]) -> List[str]:
+        """
+        Run several image searches concurrently
 
-            articles.append(article)
+        Args:
+            lookups: (query, image_type) pairs
 
-        return articles
+        Returns:
+            One image URL per lookup, in the same order
+        """
+        if len(lookups) <= 1:
+            return [self.search_for_reliable_image(query, image_type) for query, image_type in lookups]
+        return list(_IMG_POOL.map(lambda lookup: self.search_for_reliable_image(*lookup), lookups))
 
     def search_for_reliable_image(self, query: str, image_type: str = "general") -> str:
         """
         Main function to search for reliable images.
         First tries Google Images, then falls back to curated images.
+        Results go through llm_cache, which fails open on cache errors. Real
+        images are kept for a week in the in-process tier and the Django cache.
+        Placeholders are written to the Django cache only, for an hour, so a
+        failed search is retried sooner.
         """
-        # Try Google Images first
-        google_result = self.search_google_images(query, image_type)
-
-        # If Google search returned a valid result, use it
-        if google_result and not google_result.startswith('https://placehold.co') and not google_result.startswith('https://cdn.britannica.com'):
-            return google_result
+        key = llm_cache.make_key("image", image_type, query)
+        cached = llm_cache.get(key)
+        if cached is not None:
+            return cached
 
-        # Otherwise use the fallback (which includes Britannica images)
+        # Try Google Images first; it falls back to curated (Britannica) images
+        google_result = self.search_google_images(query, image_type)
+        if google_result.startswith('https://placehold.co'):
+            llm_cache.put(key, google_result, 3600, local=False)
+        else:
+            llm_cache.put(key, google_result, 7 * 24 * 3600)
         return google_result
 
+    def _source_available(self, source: str) -> bool:
+        """Whether the circuit for an image source is closed (calls allowed)"""
+        return time.monotonic() >= self._source_open_until[source]
+
+    def _record_source_result(self, source: str, ok: bool) -> None:
+        """Reset the failure count on success, open the circuit after too many failures"""
+        with self._source_lock:
+            if ok:
+                self._source_failures[source] = 0
+                return
+            self._source_failures[source] += 1
+            if self._source_failures[source] >= self._SOURCE_MAX_FAILURES:
+                self._source_open_until[source] = time.monotonic() + self._SOURCE_COOLDOWN
+                self._source_failures[source] = 0
+
     def search_google_images(self, query: str, image_type: str = "general") -> str:
         """
         Search Google Images for free using web scraping (no API key required).
         Returns the first valid image URL found.
         """
+        if not self._source_available("google"):
+            return self.get_fallback_image(query, image_type)
+
         try:
             # Prepare search query
             search_query = f"{query} {image_type}" if image_type != "general" else query
@@ -427,29 +1033,26 @@ class GroqLLMService:
             # Google Images search URL
             search_url = f"https://www.google.com/search?q={encoded_query}&tbm=isch&safe=active"
 
-            # Headers to mimic a real browser
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-
-            # Make request to Google Images
-            response = requests.get(search_url, headers=headers, timeout=10)
+            # Make request to Google Images (browser headers are set on the session)
+            response = _SESSION.get(search_url, timeout=10)
 
             if response.status_code == 200:
                 # Extract image URLs from the response
-                image_pattern = r'"(https?://[^"]*\.(?:jpg|jpeg|png|webp|gif))"'
-                matches = re.findall(image_pattern, response.text, re.IGNORECASE)
+                matches = _GOOGLE_IMAGE_RE.findall(response.text)
 
                 # Filter out unwanted domains and find a good image
                 for url in matches:
                     if self.is_valid_google_image_url(url):
+                        self._record_source_result("google", True)
                         return url
 
-            # If Google search fails, fall back to curated images
+            # Blocked (non-200 or a consent page without images); fall back to curated images
+            self._record_source_result("google", False)
             return self.get_fallback_image(query, image_type)
 
-        except Exception as e:
-            print(f"Error in Google Images search: {str(e)}")
+        except Exception:
+            logger.exception("Error in Google Images search")
+            self._record_source_result("google", False)
             return self.get_fallback_image(query, image_type)
 
     def is_valid_google_image_url(self, url: str) -> bool:
@@ -500,63 +1103,59 @@ class GroqLLMService:
             # Final fallback to placeholder
             return f"https://placehold.co/400x300/2563eb/ffffff?text={quote_plus(query[:20])}"
 
-        except Exception as e:
-            print(f"Error in fallback image search: {str(e)}")
+        except Exception:
+            logger.exception("Error in fallback image search")
             return f"https://placehold.co/400x300/2563eb/ffffff?text={quote_plus(query[:20])}"
 
     def search_britannica_images(self, query: str) -> Optional[str]:
         """
         Search Britannica for educational images.
         """
+        if not self._source_available("britannica"):
+            return None
+
         try:
             search_url = f"https://www.britannica.com/search?query={quote_plus(query)}"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-
-            response = requests.get(search_url, headers=headers, timeout=8)
+            response = _SESSION.get(search_url, timeout=8)
+            self._record_source_result("britannica", response.status_code == 200)
             if response.status_code == 200:
                 # Look for Britannica image URLs
-                image_pattern = r'(https://cdn\.britannica\.com/[^"]*\.(?:jpg|jpeg|png))'
-                matches = re.findall(image_pattern, response.text, re.IGNORECASE)
+                matches = _BRITANNICA_IMAGE_RE.findall(response.text)
 
                 if matches:
                     return matches[0]
 
             return None
 
-        except Exception as e:
-            print(f"Error searching Britannica: {str(e)}")
+        except Exception:
+            logger.exception("Error searching Britannica")
+            self._record_source_result("britannica", False)
             return None
 
     def search_unsplash_images(self, query: str, image_type: str) -> Optional[str]:
         """
         Search Unsplash for high-quality stock photos.
+
+        The Source URL redirects to a matching photo, so the probe does not
+        follow redirects and accepts any 2xx/3xx answer. Anything else returns
+        None so the caller moves on to its placeholder or icon fallback.
         """
+        if not self._source_available("unsplash"):
+            return None
+
         try:
             # Unsplash Source API (free, no key required)
-            # Categories: nature, city, technology, food, abstract, etc.
-            category_map = {
-                "technology": "technology",
-                "nature": "nature",
-                "science": "technology",
-                "business": "business",
-                "education": "education",
-                "general": "abstract"
-            }
-
-            category = category_map.get(image_type, "abstract")
+            category = _UNSPLASH_CATEGORIES.get(image_type, "abstract")
             unsplash_url = f"https://source.unsplash.com/800x600/?{category},{quote_plus(query)}"
 
-            # Test if the URL is accessible
-            response = requests.head(unsplash_url, timeout=5)
-            if response.status_code == 200:
-                return unsplash_url
-
-            return None
+            response = _SESSION.head(unsplash_url, allow_redirects=False, timeout=2)
+            ok = 200 <= response.status_code < 400
+            self._record_source_result("unsplash", ok)
+            return unsplash_url if ok else None
 
-        except Exception as e:
-            print(f"Error searching Unsplash: {str(e)}")
+        except Exception:
+            logger.exception("Error searching Unsplash")
+            self._record_source_result("unsplash", False)
             return None
 
     def generate_department_info(self, department_input: str, language: str = 'en') -> Dict[str, Any]:
@@ -570,6 +1169,13 @@ class GroqLLMService:
         Returns:
             Dictionary with department name, code, description, and logo
         """
+        # Departments are a small, near-static set, so generated info is kept
+        # for a few hours; fallbacks are never cached
+        cache_key = llm_cache.make_key('department', language, llm_cache.normalize_query(department_input))
+        dept_data = llm_cache.get(cache_key)
+        if dept_data is not None:
+            return dept_data
+
         try:
             if language == 'ar':
                 prompt = f"""
@@ -616,7 +1222,7 @@ class GroqLLMService:
                 }}
                 """
 
-            response = self.client.chat.completions.create(
+            response = self.create_chat_completion(
                 messages=[
                     {
                         "role": "user",
@@ -625,37 +1231,39 @@ class GroqLLMService:
                 ],
                 model=self.model,
                 max_tokens=2000,
-                temperature=0.5
+                temperature=0.5,
+                response_format={"type": "json_object"}
             )
 
-            result_text = response.choices[0].message.content.strip()
+            # JSON mode guarantees a parseable object
+            dept_data = loads(response.choices[0].message.content)
 
-            # Try to parse JSON response
-            try:
-                dept_data = json.loads(result_text)
+            # Get a real logo for the department
+            dept_name = dept_data.get('name', department_input)
+            dept_code = dept_data.get('code', department_input)
 
-                # Get a real logo for the department
-                dept_name = dept_data.get('name', department_input)
-                dept_code = dept_data.get('code', department_input)
+            # Search for department-specific logo
+            logo_url = self.search_department_logo(dept_name, dept_code, language)
+            dept_data['logo'] = logo_url
 
-                # Search for department-specific logo
-                logo_url = self.search_department_logo(dept_name, dept_code, language)
-                dept_data['logo'] = logo_url
+            llm_cache.put(cache_key, dept_data, ttl=_DEPARTMENT_INFO_TTL)
+            return dept_data
 
-                return dept_data
-
-            except json.JSONDecodeError:
-                # Fallback: create structured department info
-                return self._create_fallback_department(department_input, language, result_text)
-
-        except Exception as e:
-            print(f"Error in generate_department_info: {str(e)}")
+        except CircuitOpenError:
+            return self._create_fallback_department(department_input, language)
+        except Exception:
+            logger.exception("Error in generate_department_info")
             return self._create_fallback_department(department_input, language)
 
     def search_department_logo(self, dept_name: str, dept_code: str, language: str) -> str:
         """
         Search for department-specific logos
         """
+        # Known departments have a bundled icon; no network search needed
+        static_icon = _static_department_icon(dept_name, dept_code)
+        if static_icon:
+            return static_icon
+
         try:
             # Create search queries for department logos
             search_queries = [
@@ -665,56 +1273,41 @@ class GroqLLMService:
                 f"department {dept_code} symbol"
             ]
 
-            # Try each search query
-            for query in search_queries:
-                try:
-                    logo_url = self.search_for_reliable_image(query, "logo")
+            # Run the queries concurrently and take the first real image that
+            # comes back; lookups that have not started yet are cancelled
+            futures = [_IMG_POOL.submit(self.search_for_reliable_image, query, "logo") for query in search_queries]
+            try:
+                for future in as_completed(futures):
+                    try:
+                        logo_url = future.result()
+                    except Exception:
+                        continue
                     if logo_url and not logo_url.startswith('https://placehold.co'):
                         return logo_url
-                except:
-                    continue
+            finally:
+                for future in futures:
+                    future.cancel()
 
             # Fallback to icon-based search
             return self.get_department_icon_fallback(dept_name, dept_code)
 
-        except Exception as e:
-            print(f"Error searching department logo: {str(e)}")
+        except Exception:
+            logger.exception("Error searching department logo")
             return self.get_department_icon_fallback(dept_name, dept_code)
 
     def get_department_icon_fallback(self, dept_name: str, dept_code: str) -> str:
         """
         Get fallback department icons/logos
-        """
-        try:
-            # Map common departments to icon categories
-            dept_icon_map = {
-                'IT': 'technology computer server',
-                'HR': 'human resources people team',
-                'FINANCE': 'finance money accounting calculator',
-                'MARKETING': 'marketing advertising megaphone',
-                'SALES': 'sales business handshake',
-                'OPERATIONS': 'operations management gear',
-                'LEGAL': 'legal law justice scales',
-                'ADMIN': 'administration office building',
-                'RESEARCH': 'research science laboratory microscope',
-                'DEVELOPMENT': 'development engineering tools',
-                'SUPPORT': 'customer support service headset',
-                'SECURITY': 'security shield protection lock'
-            }
 
-            # Normalize department code
-            normalized_code = dept_code.upper().replace(' ', '_')
-
-            # Find matching icon category
-            icon_category = None
-            for key, category in dept_icon_map.items():
-                if key in normalized_code or key.lower() in dept_name.lower():
-                    icon_category = category
-                    break
+        Both steps are cached in-process: the icon category per department, and
+        (through search_for_reliable_image) the image found per category.
+        """
+        static_icon = _static_department_icon(dept_name, dept_code)
+        if static_icon:
+            return static_icon
 
-            # If no specific match, use generic department icon
-            if not icon_category:
-                icon_category = "department office building corporate"
+        try:
+            icon_category = _department_icon_category(dept_name, dept_code)
 
             # Search for icon
             icon_url = self.search_for_reliable_image(icon_category, "icon")
@@ -725,8 +1318,8 @@ class GroqLLMService:
 
             return icon_url
 
-        except Exception as e:
-            print(f"Error in department icon fallback: {str(e)}")
+        except Exception:
+            logger.exception("Error in department icon fallback")
             return f"https://placehold.co/200x200/3b82f6/ffffff?text={quote_plus(dept_code[:3])}"
 
     def _create_fallback_department(self, department_input: str, language: str, content_text: str = None) -> Dict[str, Any]:
@@ -741,53 +1334,19 @@ class GroqLLMService:
             # Get logo
             logo_url = self.get_department_icon_fallback(dept_name, dept_code)
 
-            if language == 'ar':
-                return {
-                    "name": dept_name,
-                    "code": dept_code,
-                    "description": f"قسم {dept_name} هو أحد الأقسام المهمة في المؤسسة، يتولى مسؤوليات متعددة ومتنوعة تساهم في تحقيق أهداف المنظمة. يعمل هذا القسم على تطوير وتنفيذ الاستراتيجيات والسياسات المتعلقة بمجال تخصصه، ويضم فريقاً من المختصين والخبراء ذوي الكفاءة العالية. يسعى القسم إلى تحقيق التميز في الأداء وتقديم أفضل الخدمات للعملاء الداخليين والخارجيين، مع الحرص على مواكبة أحدث التطورات والتقنيات في مجال عمله.",
-                    "responsibilities": [
-                        f"إدارة وتنسيق أنشطة {dept_name}",
-                        "تطوير السياسات والإجراءات",
-                        "ضمان الجودة والامتثال للمعايير",
-                        "التدريب وتطوير الموظفين",
-                        "إعداد التقارير والتحليلات"
-                    ],
-                    "objectives": [
-                        "تحقيق الأهداف الاستراتيجية للمؤسسة",
-                        "تحسين الكفاءة والإنتاجية",
-                        "ضمان رضا العملاء",
-                        "التطوير المستمر للعمليات",
-                        "الابتكار والتميز في الأداء"
-                    ],
-                    "logo": logo_url,
-                    "language": "ar"
-                }
-            else:
-                return {
-                    "name": dept_name,
-                    "code": dept_code,
-                    "description": f"The {dept_name} department is a vital component of the organization, responsible for multiple and diverse functions that contribute to achieving organizational goals. This department develops and implements strategies and policies related to its area of expertise, comprising a team of qualified specialists and experts with high competency. The department strives to achieve excellence in performance and deliver the best services to internal and external customers, while keeping pace with the latest developments and technologies in its field of work. It plays a crucial role in organizational success through effective management, strategic planning, and continuous improvement initiatives.",
-                    "responsibilities": [
-                        f"Managing and coordinating {dept_name} activities",
-                        "Developing policies and procedures",
-                        "Ensuring quality and compliance with standards",
-                        "Training and staff development",
-                        "Preparing reports and analyses"
-                    ],
-                    "objectives": [
-                        "Achieve organizational strategic goals",
-                        "Improve efficiency and productivity",
-                        "Ensure customer satisfaction",
-                        "Continuous process improvement",
-                        "Innovation and performance excellence"
-                    ],
-                    "logo": logo_url,
-                    "language": "en"
-                }
+            template = _FALLBACK_DEPARTMENT_TEMPLATES['ar' if language == 'ar' else 'en']
+            return {
+                "name": dept_name,
+                "code": dept_code,
+                "description": template["description"] % dept_name,
+                "responsibilities": [template["first_responsibility"] % dept_name, *template["responsibilities"]],
+                "objectives": template["objectives"],
+                "logo": logo_url,
+                "language": template["language"]
+            }
 
-        except Exception as e:
-            print(f"Error creating fallback department: {str(e)}")
+        except Exception:
+            logger.exception("Error creating fallback department")
             return {
                 "name": department_input,
                 "code": department_input.upper()[:3],
@@ -800,34 +1359,30 @@ class GroqLLMService:
 
     def _extract_department_code(self, department_input: str) -> str:
         """Extract or generate department code"""
-        # Common department mappings
-        dept_mappings = {
-            'information technology': 'IT',
-            'human resources': 'HR',
-            'finance': 'FIN',
-            'marketing': 'MKT',
-            'sales': 'SAL',
-            'operations': 'OPS',
-            'legal': 'LEG',
-            'administration': 'ADM',
-            'research': 'R&D',
-            'development': 'DEV',
-            'support': 'SUP',
-            'security': 'SEC'
-        }
-
         input_lower = department_input.lower()
 
-        # Check for exact matches
-        for key, code in dept_mappings.items():
-            if key in input_lower:
-                return code
+        # Exact department name first, then any known name inside the input
+        # (one regex pass; the highest-priority name wins as before)
+        code = _DEPT_CODES.get(input_lower)
+        if code:
+            return code
+        match = _first_keyword(_DEPT_NAME_INDEX, input_lower)
+        if match is not None:
+            return _DEPT_MAPPINGS[match][1]
 
         # If already looks like a code, return as is
         if len(department_input) <= 4 and department_input.isupper():
             return department_input
 
         # Generate code from first letters
+        if department_input.isascii():
+            # ASCII fast path: upper-case and split the bytes once, no per-letter strings
+            data = department_input.encode('ascii').upper()
+            words = data.split()
+            if len(words) > 1:
+                return bytes([word[0] for word in words[:3]]).decode('ascii')
+            return data[:3].decode('ascii')
+
         words = department_input.split()
         if len(words) > 1:
             return ''.join(word[0].upper() for word in words[:3])
@@ -836,43 +1391,83 @@ class GroqLLMService:
 
     def _extract_department_name(self, department_input: str, language: str) -> str:
         """Extract or generate full department name"""
-        # Common department full names
-        if language == 'ar':
-            dept_names = {
-                'IT': 'تكنولوجيا المعلومات',
-                'HR': 'الموارد البشرية',
-                'FIN': 'المالية',
-                'MKT': 'التسويق',
-                'SAL': 'المبيعات',
-                'OPS': 'العمليات',
-                'LEG': 'الشؤون القانونية',
-                'ADM': 'الإدارة',
-                'R&D': 'البحث والتطوير',
-                'DEV': 'التطوير',
-                'SUP': 'الدعم',
-                'SEC': 'الأمن'
-            }
-        else:
-            dept_names = {
-                'IT': 'Information Technology',
-                'HR': 'Human Resources',
-                'FIN': 'Finance',
-                'MKT': 'Marketing',
-                'SAL': 'Sales',
-                'OPS': 'Operations',
-                'LEG': 'Legal Affairs',
-                'ADM': 'Administration',
-                'R&D': 'Research and Development',
-                'DEV': 'Development',
-                'SUP': 'Support',
-                'SEC': 'Security'
-            }
+        dept_names = _DEPT_NAMES_AR if language == 'ar' else _DEPT_NAMES_EN
 
         # Check if input is a code
-        input_upper = department_input.upper()
-        if input_upper in dept_names:
-            return dept_names[input_upper]
+        name = dept_names.get(department_input.upper())
+        if name is not None:
+            return name
 
         # If already a full name, return as is (with proper capitalization)
         return department_input.title()
 
+
+@lru_cache(maxsize=1)
+def _token_encoding():
+    """
+    Optional tokenizer for trimming prompt input to a token budget
+
+    Loaded on first use rather than at import: tiktoken downloads the encoding
+    file the first time, which fails on offline hosts. Any failure falls back
+    to the characters-per-token estimate.
+    """
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except ImportError:
+        return None
+    except Exception:
+        logger.warning("tiktoken encoding unavailable, estimating tokens from characters", exc_info=True)
+        return None
+
+
+_SERVICE = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def get_groq_service() -> GroqLLMService:
+    """Return the process-wide GroqLLMService, creating it on first use"""
+    global _SERVICE
+    if _SERVICE is None:
+        with _SERVICE_LOCK:
+            if _SERVICE is None:
+                _SERVICE = GroqLLMService()
+    return _SERVICE
+
+
+@lru_cache(maxsize=256)
+def _static_department_icon(dept_name: str, dept_code: str) -> Optional[str]:
+    """
+    URL of the bundled icon (articles/static/articles/icons) for a known
+    department code or exact department name, or None for other departments
+    """
+    code = dept_code.strip().upper()
+    if code not in _DEPT_NAMES_EN:
+        code = _DEPT_CODES.get(dept_name.strip().lower())
+        if code is None:
+            return None
+    return static('articles/icons/%s.svg' % code.lower().replace('&', ''))
+
+
+@lru_cache(maxsize=512)
+def _department_icon_category(dept_name: str, dept_code: str) -> str:
+    """Icon search terms for a department, by code first and then by name"""
+    # Normalize department code
+    normalized_code = dept_code.upper().replace(' ', '_')
+
+    # Exact code match first, then substring match on code or name
+    icon_category = _DEPT_ICON_MAP.get(_DEPT_CODE_ALIASES.get(normalized_code, normalized_code))
+    if icon_category:
+        return icon_category
+    matches = [
+        match for match in (
+            _first_keyword(_DEPT_ICON_CODE_INDEX, normalized_code),
+            _first_keyword(_DEPT_ICON_NAME_INDEX, dept_name.lower())
+        )
+        if match is not None
+    ]
+    if matches:
+        return _DEPT_ICON_CATEGORIES[min(matches)]
+
+    # If no specific match, use generic department icon
+    return "department office building corporate"
@@ -0,0 +1,28 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib json module
+    orjson = None
+
+
+def dumps(data, default=None) -> bytes:
+    """
+    Serialize data to UTF-8 JSON bytes, using orjson when available
+
+    default, if given, is called for objects neither encoder supports natively.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=default)
+    return json.dumps(data, ensure_ascii=False, default=default).encode('utf-8')
+
+
+def loads(data):
+    """
+    Parse JSON from str or bytes, using orjson when available
+
+    Raises json.JSONDecodeError on invalid input (orjson's error subclasses it).
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
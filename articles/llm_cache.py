@@ -0,0 +1,81 @@
+"""
+Two-tier cache for parsed LLM responses (and resolved image URLs)
+
+Entries live in a small in-process LRU for hot keys and in the Django cache
+(Redis when REDIS_URL is set) so they are shared across workers. Values are
+stored as JSON bytes, so every get() returns a fresh copy the caller may
+mutate. The cache fails open: if the Django cache backend errors, get()
+reports a miss and put() only keeps the local copy.
+"""
+from collections import OrderedDict
+from django.core.cache import cache
+import hashlib
+import logging
+import threading
+import time
+import unicodedata
+from typing import Any, Optional
+
+from .json_utils import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 24 * 3600
+
+_LOCAL_MAX_ENTRIES = 1024
+_LOCAL_REFILL_TTL = 300
+_local = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def normalize_query(query: str) -> str:
+    """Fold case, Unicode forms and whitespace so trivially different queries share a key"""
+    return ' '.join(unicodedata.normalize('NFKC', query).casefold().split())
+
+
+def make_key(namespace: str, *parts) -> str:
+    """Build a cache key from a namespace and the parts that determine the response"""
+    raw = '|'.join(str(part) for part in parts)
+    return f"llm:{namespace}:" + hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def get(key: str) -> Optional[Any]:
+    """Return a copy of the cached value, or None on a miss"""
+    with _local_lock:
+        entry = _local.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                _local.move_to_end(key)
+                return loads(entry[1])
+            del _local[key]
+
+    try:
+        data = cache.get(key)
+    except Exception:
+        logger.warning("LLM cache read failed, treating as a miss", exc_info=True)
+        return None
+    if data is None:
+        return None
+    # The remaining TTL is unknown here, so keep the local copy briefly
+    _remember(key, data, _LOCAL_REFILL_TTL)
+    return loads(data)
+
+
+def put(key: str, value: Any, ttl: int = DEFAULT_TTL, local: bool = True) -> None:
+    """Cache a JSON-serializable value in both tiers, or only the shared one if local is False"""
+    data = dumps(value)
+    if local:
+        _remember(key, data, ttl)
+    try:
+        cache.set(key, data, ttl)
+    except Exception:
+        logger.warning("LLM cache write failed, %s", "keeping the entry in-process only" if local else "entry not cached",
+                       exc_info=True)
+
+
+def _remember(key: str, data: bytes, ttl: int) -> None:
+    with _local_lock:
+        _local[key] = (time.monotonic() + ttl, data)
+        _local.move_to_end(key)
+        if len(_local) > _LOCAL_MAX_ENTRIES:
+            _local.popitem(last=False)
@@ -0,0 +1,23 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from article_search_project.api_root_payload import PAYLOAD, PAYLOAD_WITHOUT_ADMIN
+
+
+class Command(BaseCommand):
+    help = "Write the API root JSON payload to STATIC_ROOT so a web server can serve it directly"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            help="Output file path (default: STATIC_ROOT/api-root.json)"
+        )
+
+    def handle(self, *args, **options):
+        output = Path(options['output'] or Path(settings.STATIC_ROOT) / 'api-root.json')
+        payload = PAYLOAD if settings.ENABLE_ADMIN else PAYLOAD_WITHOUT_ADMIN
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_bytes(payload)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(payload)} bytes to {output}"))
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-15 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='articlesearchresult',
+            index=models.Index(fields=['search_query', 'language', '-created_at'], name='asr_query_lang_ct_idx'),
+        ),
+    ]
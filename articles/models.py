@@ -19,10 +19,20 @@ class ArticleSearchResult(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Listing results for a query in one language, newest first
+            models.Index(fields=['search_query', 'language', '-created_at'], name='asr_query_lang_ct_idx'),
+        ]
         
     def __str__(self):
         return f"{self.title} ({self.language})"
 
+class ContentManager(models.Manager):
+    """Manager that always loads the related search result in the same query"""
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('search_result')
+
 class ArticleContent(models.Model):
     """Model to store fetched article content"""
     
@@ -33,6 +43,8 @@ class ArticleContent(models.Model):
     publish_date = models.DateTimeField(blank=True, null=True)
     keywords = models.JSONField(default=list, blank=True)
     fetched_at = models.DateTimeField(auto_now_add=True)
+
+    objects = ContentManager()
     
     def __str__(self):
         return f"Content for: {self.search_result.title}"
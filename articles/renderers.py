@@ -0,0 +1,57 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from .json_utils import dumps
+
+_ENCODER = JSONEncoder()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson
+
+    orjson handles dicts, lists, str/int subclasses (ReturnDict, ErrorDetail),
+    UUIDs and datetimes natively; anything else (lazy translations, Decimal,
+    querysets) goes through DRF's own encoder. Output is always compact.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return dumps(data, default=_ENCODER.default)
+
+
+class NDJSONRenderer(ORJSONRenderer):
+    """
+    Renders one JSON object per line for clients that accept application/x-ndjson
+
+    Views that stream NDJSON return a StreamingHttpResponse themselves; this
+    renderer lets such clients pass content negotiation and renders any plain
+    Response (such as a validation error) as a single line.
+    """
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return super().render(data, accepted_media_type, renderer_context) + b'\n'
+
+
+class EventStreamRenderer(ORJSONRenderer):
+    """
+    Renders a payload as a single server-sent event for text/event-stream clients
+
+    Views that stream events return a StreamingHttpResponse themselves; this
+    renderer lets such clients pass content negotiation and renders any plain
+    Response (such as a validation error) as one data: event.
+    """
+
+    media_type = 'text/event-stream'
+    format = 'sse'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return b'data: ' + super().render(data, accepted_media_type, renderer_context) + b'\n\n'
@@ -1,4 +1,69 @@
 from rest_framework import serializers
+from typing import Any, Dict, Optional
+import re
+import uuid
+
+# Characters DRF's CharField rejects (null and lone surrogates)
+_INVALID_CHARS_RE = re.compile('[\x00\ud800-\udfff]')
+_LANGUAGES = frozenset(('en', 'ar'))
+
+
+def _fast_char(value: Any, max_length: int) -> Optional[str]:
+    """Trimmed, non-blank string within max_length, or None"""
+    if type(value) is not str:
+        return None
+    value = value.strip()
+    if not value or len(value) > max_length or _INVALID_CHARS_RE.search(value):
+        return None
+    return value
+
+
+def fast_validate_search_request(data) -> Optional[Dict[str, Any]]:
+    """
+    Validate a well-formed search request without DRF field machinery
+
+    Returns the same validated data as SearchRequestSerializer when the payload
+    is a plain JSON object with correctly typed values; returns None otherwise,
+    so the caller falls back to the serializer and its field-level errors.
+    """
+    if type(data) is not dict:
+        return None
+    query = _fast_char(data.get('query'), 200)
+    language = data.get('language', 'en')
+    max_results = data.get('max_results', 5)
+    # Type checks come first: unhashable values would break the set lookup
+    if query is None or type(language) is not str or language not in _LANGUAGES:
+        return None
+    if type(max_results) is not int or not 1 <= max_results <= 10:
+        return None
+    return {'query': query, 'language': language, 'max_results': max_results}
+
+
+def fast_validate_content_request(data) -> Optional[Dict[str, Any]]:
+    """Fast path for ContentRequestSerializer; see fast_validate_search_request"""
+    if type(data) is not dict:
+        return None
+    article_id = data.get('article_id')
+    if type(article_id) is not str:
+        return None
+    try:
+        article_id = uuid.UUID(hex=article_id)
+    except ValueError:
+        return None
+    validated = {'article_id': article_id}
+    if 'query' in data:
+        query = _fast_char(data['query'], 200)
+        if query is None:
+            return None
+        validated['query'] = query
+    language = data.get('language', 'en')
+    include_summary = data.get('include_summary', True)
+    if type(language) is not str or language not in _LANGUAGES or type(include_summary) is not bool:
+        return None
+    validated['language'] = language
+    validated['include_summary'] = include_summary
+    return validated
+
 
 class CategorySerializer(serializers.Serializer):
     """Serializer for article category information"""
@@ -1,14 +1,58 @@
+from django.core.cache import cache
+import hashlib
 import requests
 from typing import List, Dict, Any
-from urllib.parse import quote
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit
 import json
+import logging
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
+from xml.etree import ElementTree
 from duckduckgo_search import DDGS
 
+logger = logging.getLogger(__name__)
+
+# Seconds to keep DuckDuckGo results for an identical (query, language, max_results)
+_SEARCH_CACHE_TTL = 15 * 60
+
+# RSS feeds are fetched concurrently over one pooled session
+_FEED_SESSION = requests.Session()
+_FEED_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="rss-feed")
+
+# Non-article results: social/video domains in the URL, or more than one
+# shopping/video keyword in the title and snippet (case-insensitive substrings)
+_EXCLUDE_DOMAINS = ('youtube.com', 'twitter.com', 'facebook.com', 'instagram.com', 'reddit.com')
+_EXCLUDE_DOMAIN_RE = re.compile('|'.join(re.escape(domain) for domain in _EXCLUDE_DOMAINS), re.IGNORECASE)
+# Ask DuckDuckGo to leave those domains out so fewer results are discarded
+_EXCLUDE_SITES_QUERY = ' '.join(f'-site:{domain}' for domain in _EXCLUDE_DOMAINS)
+_EXCLUDE_KEYWORD_RE = re.compile(r'video|watch|download|buy|shop|price', re.IGNORECASE)
+
+# Query parameters that only track the click and never change the page
+_TRACKING_PARAMS = frozenset({'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content', 'fbclid', 'gclid'})
+
+
+def _canonical_url(url: str) -> str:
+    """
+    Normalize a URL for duplicate detection
+
+    Ignores the scheme, host case, "www.", a trailing slash, the fragment and
+    tracking parameters, so http://www.x.com/a/ and https://x.com/a?utm_source=y
+    compare equal.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in _TRACKING_PARAMS])
+    return f"{host}{parts.path.rstrip('/')}?{query}"
+
+
 class ArticleSearchService:
     """Service for searching articles across different sources"""
     
     def __init__(self):
+        # One long-lived client per service, reused across searches
         self.ddgs = DDGS()
     
     def search_articles(self, query: str, language: str = 'en', max_results: int = 5) -> List[Dict[str, Any]]:
@@ -23,6 +67,17 @@ class ArticleSearchService:
         Returns:
             List of article dictionaries with title, url, snippet
         """
+        # Identical searches within the TTL are served from the cache; a cache
+        # error counts as a miss so it never replaces real results
+        key = f"ddg:{language}:{max_results}:" + hashlib.sha1(query.encode('utf-8')).hexdigest()
+        try:
+            cached = cache.get(key)
+        except Exception:
+            logger.warning("Search cache read failed, treating as a miss", exc_info=True)
+            cached = None
+        if cached is not None:
+            return cached
+
         try:
             results = []
             
@@ -31,12 +86,18 @@ class ArticleSearchService:
             results.extend(ddg_results)
             
             # Remove duplicates and limit results
-            unique_results = self._remove_duplicates(results)
-            return unique_results[:max_results]
-            
-        except Exception as e:
-            print(f"Error in search_articles: {str(e)}")
+            unique_results = self._remove_duplicates(results)[:max_results]
+        except Exception:
+            logger.exception("Error in search_articles")
             return []
+
+        # Only cache real results, not the mock fallback
+        if unique_results and all(result['source'] != 'fallback' for result in unique_results):
+            try:
+                cache.set(key, unique_results, _SEARCH_CACHE_TTL)
+            except Exception:
+                logger.warning("Search cache write failed, results not cached", exc_info=True)
+        return unique_results
     
     def _search_duckduckgo_real(self, query: str, language: str, max_results: int) -> List[Dict[str, Any]]:
         """Real DuckDuckGo search using duckduckgo-search package"""
@@ -47,69 +108,60 @@ class ArticleSearchService:
                 search_query = f"{query} lang:ar OR site:arabic OR الـ"
             else:
                 search_query = query
+            search_query = f"{search_query} {_EXCLUDE_SITES_QUERY}"
             
             # Perform search using DuckDuckGo
             search_results = []
             
-            # Use text search
-            with self.ddgs as ddgs:
-                results = ddgs.text(
-                    keywords=search_query,
-                    region='wt-wt',  # Worldwide
-                    safesearch='moderate',
-                    timelimit=None,
-                    max_results=max_results * 2  # Get more results to filter
-                )
-                
-                for result in results:
-                    if len(search_results) >= max_results:
-                        break
-                        
-                    # Filter for article-like content
-                    title = result.get('title', '')
-                    url = result.get('href', '')
-                    snippet = result.get('body', '')
+            # Use text search on the long-lived client (no per-call session setup)
+            results = self.ddgs.text(
+                keywords=search_query,
+                region='wt-wt',  # Worldwide
+                safesearch='moderate',
+                timelimit=None,
+                max_results=max_results + 2  # A few extra for the article filter
+            )
+            
+            for result in results:
+                if len(search_results) >= max_results:
+                    break
                     
-                    # Basic filtering for article content
-                    if self._is_article_like(title, url, snippet):
-                        search_results.append({
-                            'title': title,
-                            'url': url,
-                            'snippet': snippet,
-                            'source': 'duckduckgo'
-                        })
+                # Filter for article-like content
+                title = result.get('title', '')
+                url = result.get('href', '')
+                snippet = result.get('body', '')
+                
+                # Basic filtering for article content
+                if self._is_article_like(title, url, snippet):
+                    search_results.append({
+                        'title': title,
+                        'url': url,
+                        'snippet': snippet,
+                        'source': 'duckduckgo'
+                    })
             
             return search_results
             
-        except Exception as e:
-            print(f"Error in DuckDuckGo search: {str(e)}")
+        except Exception:
+            logger.exception("Error in DuckDuckGo search")
             # Fallback to mock data if search fails
             return self._get_fallback_results(query, language, max_results)
     
     def _is_article_like(self, title: str, url: str, snippet: str) -> bool:
         """Check if the result looks like an article"""
-        # Filter out non-article content
-        exclude_domains = ['youtube.com', 'twitter.com', 'facebook.com', 'instagram.com', 'reddit.com']
-        exclude_keywords = ['video', 'watch', 'download', 'buy', 'shop', 'price']
-        
-        # Check URL
-        for domain in exclude_domains:
-            if domain in url.lower():
-                return False
-        
-        # Check title and snippet for article indicators
-        article_indicators = ['article', 'news', 'report', 'analysis', 'study', 'research', 'guide']
-        content = (title + ' ' + snippet).lower()
-        
         # Must have reasonable length
         if len(title) < 10 or len(snippet) < 50:
             return False
-        
-        # Exclude if contains too many exclude keywords
-        exclude_count = sum(1 for keyword in exclude_keywords if keyword in content)
-        if exclude_count > 1:
+
+        # Filter out non-article content
+        if _EXCLUDE_DOMAIN_RE.search(url):
             return False
-        
+
+        # Exclude if title and snippet mention more than one exclude keyword
+        keywords = set(_EXCLUDE_KEYWORD_RE.findall(title)) | set(_EXCLUDE_KEYWORD_RE.findall(snippet))
+        if len({keyword.lower() for keyword in keywords}) > 1:
+            return False
+
         return True
     
     def _get_fallback_results(self, query: str, language: str, max_results: int) -> List[Dict[str, Any]]:
@@ -146,18 +198,22 @@ class ArticleSearchService:
             ]
     
     def _remove_duplicates(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove duplicate results based on URL"""
+        """Remove duplicate results based on their canonical URL"""
         seen_urls = set()
         unique_results = []
         
         for result in results:
             url = result.get('url', '')
-            if url and url not in seen_urls:
-                seen_urls.add(url)
+            if not url:
+                continue
+            key = _canonical_url(url)
+            if key not in seen_urls:
+                seen_urls.add(key)
                 unique_results.append(result)
         
         return unique_results
 
+
 class NewsAPISearchService:
     """Alternative search service using news APIs"""
     
@@ -173,8 +229,37 @@ class NewsAPISearchService:
         }
     
     def search_news_articles(self, query: str, language: str = 'en') -> List[Dict[str, Any]]:
-        """Search for news articles"""
-        # Implementation for news-specific search
-        # This would integrate with news APIs or RSS feeds
-        return []
+        """
+        Search the configured RSS feeds for items mentioning the query
+
+        All feeds are fetched concurrently, so the call takes about as long as
+        the slowest feed rather than the sum of all of them.
+        """
+        feeds = self.news_sources['rss_feeds']
+        query_lower = query.lower()
+        results = []
+        for items in _FEED_POOL.map(self._fetch_feed, feeds):
+            for item in items:
+                if query_lower in item['title'].lower() or query_lower in item['snippet'].lower():
+                    results.append(item)
+        return results
+
+    def _fetch_feed(self, url: str) -> List[Dict[str, Any]]:
+        """Fetch and parse one RSS feed, returning [] if it is unavailable"""
+        try:
+            response = _FEED_SESSION.get(url, timeout=5)
+            response.raise_for_status()
+            channel = ElementTree.fromstring(response.content)
+            return [
+                {
+                    'title': (item.findtext('title') or '').strip(),
+                    'url': (item.findtext('link') or '').strip(),
+                    'snippet': (item.findtext('description') or '').strip(),
+                    'source': 'rss'
+                }
+                for item in channel.iter('item')
+            ]
+        except Exception:
+            logger.exception("Error fetching RSS feed %s", url)
+            return []
 
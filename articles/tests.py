@@ -1,3 +1,290 @@
-from django.test import TestCase
+import asyncio
+import threading
+import time
+import uuid
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from . import llm_cache
+from .batcher import SingleFlight
+from .circuit import CircuitBreaker, CircuitOpenError
+from .serializers import (
+    ContentRequestSerializer,
+    SearchRequestSerializer,
+    fast_validate_content_request,
+    fast_validate_search_request,
+)
+
+
+def _fail():
+    raise ConnectionError("upstream down")
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    """Closed / open / half-open transitions of CircuitBreaker"""
+
+    def _open_breaker(self, reset_timeout=60.0):
+        breaker = CircuitBreaker("test", max_failures=2, reset_timeout=reset_timeout)
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                breaker.call(_fail)
+        return breaker
+
+    def test_opens_after_max_failures(self):
+        breaker = self._open_breaker()
+        fn = mock.Mock()
+        with self.assertRaises(CircuitOpenError):
+            breaker.call(fn)
+        fn.assert_not_called()
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker("test", max_failures=2, reset_timeout=60)
+        with self.assertRaises(ConnectionError):
+            breaker.call(_fail)
+        self.assertEqual(breaker.call(lambda: "ok"), "ok")
+        with self.assertRaises(ConnectionError):
+            breaker.call(_fail)
+        self.assertEqual(breaker.call(lambda: "ok"), "ok")
+
+    def test_ignored_exceptions_do_not_open(self):
+        breaker = CircuitBreaker("test", max_failures=1, reset_timeout=60,
+                                 is_failure=lambda exc: not isinstance(exc, ValueError))
+
+        def reject():
+            raise ValueError("bad request")
+
+        for _ in range(3):
+            with self.assertRaises(ValueError):
+                breaker.call(reject)
+        self.assertEqual(breaker.call(lambda: "ok"), "ok")
+
+    def test_half_open_trial_success_closes(self):
+        breaker = self._open_breaker(reset_timeout=0.05)
+        time.sleep(0.1)
+        self.assertEqual(breaker.call(lambda: "ok"), "ok")
+        self.assertEqual(breaker.call(lambda: "again"), "again")
+
+    def test_half_open_trial_failure_reopens(self):
+        breaker = self._open_breaker(reset_timeout=0.05)
+        time.sleep(0.1)
+        with self.assertRaises(ConnectionError):
+            breaker.call(_fail)
+        with self.assertRaises(CircuitOpenError):
+            breaker.call(lambda: "ok")
+
+    def test_only_one_trial_at_a_time(self):
+        breaker = self._open_breaker(reset_timeout=0.05)
+        time.sleep(0.1)
+
+        def trial():
+            with self.assertRaises(CircuitOpenError):
+                breaker.call(lambda: "concurrent")
+            return "trial"
+
+        self.assertEqual(breaker.call(trial), "trial")
+
+    def test_cancelled_async_trial_frees_the_trial(self):
+        breaker = self._open_breaker(reset_timeout=0.05)
+        time.sleep(0.1)
+
+        async def cancelled():
+            raise asyncio.CancelledError()
+
+        async def ok():
+            return "ok"
+
+        with self.assertRaises(asyncio.CancelledError):
+            asyncio.run(breaker.acall(cancelled))
+        self.assertEqual(asyncio.run(breaker.acall(ok)), "ok")
+
+    def test_interrupted_trial_frees_the_trial(self):
+        breaker = self._open_breaker(reset_timeout=0.05)
+        time.sleep(0.1)
+
+        def interrupted():
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            breaker.call(interrupted)
+        self.assertEqual(breaker.call(lambda: "ok"), "ok")
+
+
+class SingleFlightTests(SimpleTestCase):
+    """Coalescing of concurrent calls in SingleFlight"""
+
+    def _run_concurrently(self, flight, fn, callers=4):
+        """Start a leader blocked inside fn, then followers; return (results, errors)"""
+        started, release = threading.Event(), threading.Event()
+        results, errors = [], []
+
+        def blocking():
+            started.set()
+            release.wait(5)
+            return fn()
+
+        def caller():
+            try:
+                results.append(flight.do("key", blocking))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=caller) for _ in range(callers)]
+        threads[0].start()
+        self.assertTrue(started.wait(5))
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.1)  # let the followers reach do() and block on the leader
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        return results, errors
+
+    def test_concurrent_calls_share_one_result(self):
+        flight = SingleFlight()
+        fn = mock.Mock(return_value={"articles": []})
+        results, errors = self._run_concurrently(flight, fn)
+        self.assertEqual(errors, [])
+        self.assertEqual(fn.call_count, 1)
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_errors_reach_every_caller(self):
+        flight = SingleFlight()
+        fn = mock.Mock(side_effect=ValueError("generation failed"))
+        results, errors = self._run_concurrently(flight, fn)
+        self.assertEqual(results, [])
+        self.assertEqual(fn.call_count, 1)
+        self.assertEqual(len(errors), 4)
+        self.assertTrue(all(isinstance(error, ValueError) for error in errors))
+
+    def test_key_is_released_after_the_call(self):
+        flight = SingleFlight()
+        with self.assertRaises(ValueError):
+            flight.do("key", mock.Mock(side_effect=ValueError))
+        fn = mock.Mock(return_value="ok")
+        self.assertEqual(flight.do("key", fn), "ok")
+        self.assertEqual(flight.do("key", fn), "ok")
+        self.assertEqual(fn.call_count, 2)
+
+
+class LLMCacheTests(SimpleTestCase):
+    """Two-tier llm_cache: fail-open backend errors and local TTL expiry"""
+
+    def _key(self):
+        return llm_cache.make_key("test", self.id(), uuid.uuid4())
+
+    def test_backend_errors_fail_open(self):
+        broken = mock.Mock()
+        broken.get.side_effect = ConnectionError("redis down")
+        broken.set.side_effect = ConnectionError("redis down")
+        key = self._key()
+        with mock.patch.object(llm_cache, "cache", broken):
+            self.assertIsNone(llm_cache.get(key))
+            llm_cache.put(key, {"full_text": "text"})
+            self.assertEqual(llm_cache.get(key), {"full_text": "text"})
+            llm_cache.put(self._key(), "shared only", local=False)
+
+    def test_local_entries_expire(self):
+        backend = mock.Mock()
+        backend.get.return_value = None
+        key = self._key()
+        with mock.patch.object(llm_cache, "cache", backend), mock.patch.object(llm_cache, "time") as clock:
+            clock.monotonic.return_value = 1000.0
+            llm_cache.put(key, ["value"], ttl=10)
+            clock.monotonic.return_value = 1009.0
+            self.assertEqual(llm_cache.get(key), ["value"])
+            clock.monotonic.return_value = 1011.0
+            self.assertIsNone(llm_cache.get(key))
+
+    def test_shared_hit_refills_local_tier(self):
+        backend = mock.Mock()
+        backend.get.return_value = b'{"title":"cached"}'
+        key = self._key()
+        with mock.patch.object(llm_cache, "cache", backend):
+            self.assertEqual(llm_cache.get(key), {"title": "cached"})
+            backend.get.return_value = None
+            self.assertEqual(llm_cache.get(key), {"title": "cached"})
+
+    def test_get_returns_a_fresh_copy(self):
+        backend = mock.Mock()
+        backend.get.return_value = None
+        key = self._key()
+        with mock.patch.object(llm_cache, "cache", backend):
+            llm_cache.put(key, {"keywords": ["a"]})
+            llm_cache.get(key)["keywords"].append("b")
+            self.assertEqual(llm_cache.get(key), {"keywords": ["a"]})
+
+
+class FastValidatorParityTests(SimpleTestCase):
+    """The fast validators accept only what the DRF serializers accept, with the same result"""
+
+    ARTICLE_ID = "0f8b7c8e-4f4e-4d2a-9a65-2d1c2c7e4b10"
+
+    def assertParity(self, fast_validate, serializer_class, data):
+        fast = fast_validate(data)
+        serializer = serializer_class(data=data)
+        valid = serializer.is_valid()
+        if fast is not None:
+            self.assertTrue(valid, (data, serializer.errors))
+            self.assertEqual(fast, dict(serializer.validated_data))
+        return fast, valid
+
+    def test_search_valid(self):
+        for data in (
+            {"query": "ai"},
+            {"query": "  machine learning  ", "language": "ar", "max_results": 10},
+            {"query": "x" * 200, "max_results": 1},
+        ):
+            fast, _ = self.assertParity(fast_validate_search_request, SearchRequestSerializer, data)
+            self.assertIsNotNone(fast, data)
+
+    def test_search_invalid(self):
+        for data in (
+            [],
+            "query",
+            {},
+            {"query": ""},
+            {"query": "   "},
+            {"query": None},
+            {"query": "x" * 201},
+            {"query": "a\x00b"},
+            {"query": "ai", "language": "fr"},
+            {"query": "ai", "language": ["en"]},
+            {"query": "ai", "language": {"en": 1}},
+            {"query": "ai", "language": None},
+            {"query": "ai", "max_results": 0},
+            {"query": "ai", "max_results": 11},
+            {"query": "ai", "max_results": 1.5},
+            {"query": "ai", "max_results": True},
+            {"query": "ai", "max_results": [5]},
+        ):
+            fast, valid = self.assertParity(fast_validate_search_request, SearchRequestSerializer, data)
+            self.assertIsNone(fast, data)
+            self.assertFalse(valid, data)
+
+    def test_content_valid(self):
+        for data in (
+            {"article_id": self.ARTICLE_ID},
+            {"article_id": self.ARTICLE_ID.upper(), "query": " ai ", "language": "ar", "include_summary": False},
+        ):
+            fast, _ = self.assertParity(fast_validate_content_request, ContentRequestSerializer, data)
+            self.assertIsNotNone(fast, data)
+
+    def test_content_invalid(self):
+        for data in (
+            [],
+            {},
+            {"article_id": None},
+            {"article_id": "not-a-uuid"},
+            {"article_id": [self.ARTICLE_ID]},
+            {"article_id": self.ARTICLE_ID, "query": ""},
+            {"article_id": self.ARTICLE_ID, "query": "x" * 201},
+            {"article_id": self.ARTICLE_ID, "language": "fr"},
+            {"article_id": self.ARTICLE_ID, "language": ["en"]},
+            {"article_id": self.ARTICLE_ID, "include_summary": "maybe"},
+            {"article_id": self.ARTICLE_ID, "include_summary": None},
+        ):
+            fast, valid = self.assertParity(fast_validate_content_request, ContentRequestSerializer, data)
+            self.assertIsNone(fast, data)
+            self.assertFalse(valid, data)
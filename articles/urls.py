@@ -1,12 +1,14 @@
 from django.urls import path
-from .views import ArticleSearchView, ArticleContentView, HealthCheckView, DepartmentInfoView
+from .views import ArticleSearchView, ArticleSearchStreamView, ArticleContentView, DepartmentInfoView, health_check
 
 app_name = 'articles'
 
+# Keep the hot endpoints at the top; patterns are matched in order
 urlpatterns = [
     path('search/', ArticleSearchView.as_view(), name='article-search'),
+    path('search/stream/', ArticleSearchStreamView.as_view(), name='article-search-stream'),
     path('content/', ArticleContentView.as_view(), name='article-content'),
     path('department/', DepartmentInfoView.as_view(), name='department-info'),
-    path('health/', HealthCheckView.as_view(), name='health-check'),
+    path('health/', health_check, name='health-check'),
 ]
 
@@ -1,12 +1,182 @@
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views.decorators.http import require_safe
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from .serializers import (
     SearchRequestSerializer, SearchResponseSerializer,
-    ContentRequestSerializer, ContentResponseSerializer
+    ContentRequestSerializer, ContentResponseSerializer,
+    fast_validate_search_request, fast_validate_content_request
 )
-from .groq_service import GroqLLMService
+from .circuit import CircuitOpenError
+from .groq_service import get_groq_service
+from .batcher import SingleFlight
+from .json_utils import dumps, loads
+from .renderers import EventStreamRenderer, NDJSONRenderer, ORJSONRenderer
+from . import llm_cache
+import json
+import logging
+import threading
 import uuid
+from urllib.parse import quote_plus
+
+logger = logging.getLogger(__name__)
+
+# Prompts for full article content, formatted with {query}; literal JSON braces
+# are doubled. The query comes last so every request shares the same prefix,
+# which is what provider-side prompt caching can reuse
+_CONTENT_PROMPTS = {
+    'ar': """أنشئ مقالاً تفصيلياً شاملاً حول الموضوع المذكور في النهاية. يجب أن يتضمن:
+
+1. المحتوى الكامل (أكثر من 800 كلمة)
+2. الفئة مع: الاسم، وصف مفصل (200+ كلمة)، رابط ويكيبيديا، صورة
+3. المؤلف مع: الاسم، المهنة، وصف مفصل، رابط ويكيبيديا، صورة
+4. الكلمات المفتاحية (10-15 كلمة)
+5. ملخص شامل (250-300 كلمة)
+6. تاريخ النشر
+
+أرجع النتيجة بتنسيق JSON صالح.
+
+الموضوع: "{query}"
+""",
+    'en': """Create a comprehensive detailed article about the topic given at the end. Include:
+
+1. Full article content (800+ words)
+2. Category with: name, detailed description (200+ words), wikipedia link, image
+3. Author with: name, profession, detailed description, wikipedia link, image
+4. Keywords (10-15 keywords)
+5. Comprehensive summary (250-300 words)
+6. Publication date
+
+Return as valid JSON:
+{{
+  "full_text": "Complete article content...",
+  "category": {{
+    "name": "Category Name",
+    "description": "Detailed description...",
+    "wikipedia_link": "https://en.wikipedia.org/wiki/...",
+    "image": "https://example.com/image.jpg"
+  }},
+  "author": {{
+    "name": "Author Name",
+    "profession": "profession",
+    "description": "Detailed bio...",
+    "wikipedia_link": "https://en.wikipedia.org/wiki/...",
+    "image": "https://example.com/author.jpg"
+  }},
+  "keywords": ["keyword1", "keyword2", ...],
+  "summary": "Comprehensive summary...",
+  "publish_date": "2024-01-15"
+}}
+
+Topic: "{query}"
+"""
+}
+
+# Static text for fallback article content, formatted with {query}; only the
+# placeholders are filled in per call
+_FALLBACK_CONTENT_TEMPLATES = {
+    'ar': {
+        "full_text": "محتوى مفصل حول {query}. هذا المقال يقدم تحليلاً شاملاً للموضوع مع استعراض الجوانب المختلفة والتطورات الحديثة. يهدف هذا المحتوى إلى تقديم فهم شامل للقارئ حول {query} وتأثيراته على المجتمع والاقتصاد. كما يستكشف المقال التحديات والفرص المرتبطة بهذا الموضوع، ويقدم رؤى من خبراء مختصين في المجال. المقال مدعوم بأمثلة عملية ودراسات حالة توضح التطبيقات الواقعية للموضوع. يتناول المقال أيضاً التطورات التاريخية والاتجاهات المستقبلية المتعلقة بـ {query}، مما يوفر للقارئ نظرة شاملة ومتوازنة حول الموضوع.",
+        "category": {
+            "name": "معلومات عامة",
+            "description": "فئة شاملة تغطي مواضيع متنوعة ومعلومات عامة مفيدة للقراء. تشمل هذه الفئة مجالات واسعة من المعرفة والعلوم والتكنولوجيا والثقافة. تهدف إلى تقديم محتوى عالي الجودة يساعد القراء على فهم العالم من حولهم بشكل أفضل. تتميز هذه الفئة بالتنوع والشمولية، حيث تغطي موضوعات تتراوح من العلوم الطبيعية إلى العلوم الإنسانية، ومن التكنولوجيا الحديثة إلى التاريخ والثقافة. كما تركز على تقديم المعلومات بطريقة مبسطة ومفهومة للجمهور العام، مع الحفاظ على الدقة العلمية والموضوعية في العرض.",
+            "wikipedia_link": "https://ar.wikipedia.org/wiki/معلومات_عامة"
+        },
+        "category_image_query": "معلومات عامة",
+        "author": {
+            "name": "د. محمد الكاتب",
+            "profession": "كاتب وباحث",
+            "description": "خبير متخصص في الكتابة والبحث العلمي مع خبرة تزيد عن 20 عاماً في مجال التأليف والنشر. حاصل على درجة الدكتوراه في الأدب العربي ومؤلف لأكثر من 15 كتاباً في مجالات متنوعة. يعمل كأستاذ جامعي ومستشار تحريري لعدة مجلات علمية محكمة. له مساهمات بارزة في تطوير المحتوى العربي الرقمي وتبسيط المعلومات العلمية للجمهور العام. يتميز بأسلوبه الواضح والمباشر في الكتابة، ويحرص على تقديم المعلومات بطريقة شيقة ومفيدة.",
+            "wikipedia_link": "https://ar.wikipedia.org/wiki/محمد_الكاتب"
+        },
+        "author_image_query": "د. محمد الكاتب",
+        "keywords": ("معلومات", "تحليل", "دراسة", "بحث", "علوم", "تكنولوجيا", "ثقافة", "تعليم", "معرفة"),
+        "summary": "ملخص شامل للمقال حول {query} يغطي النقاط الرئيسية والاستنتاجات المهمة. يقدم هذا الملخص نظرة عامة على الموضوع مع التركيز على الجوانب الأكثر أهمية وتأثيراً. يتناول التطورات الحديثة والاتجاهات المستقبلية، ويقدم تحليلاً متوازناً للتحديات والفرص المرتبطة بالموضوع.",
+        "publish_date": "2024-01-15"
+    },
+    'en': {
+        "full_text": "Detailed content about {query}. This article provides comprehensive analysis of the topic with various aspects and recent developments. The content aims to give readers a thorough understanding of {query} and its implications for society and economy. The article examines challenges and opportunities related to this topic, offering insights from field experts. It is supported by practical examples and case studies that illustrate real-world applications of the subject matter. The piece also explores historical developments and future trends related to {query}, providing readers with a comprehensive and balanced view of the topic. The article is designed to be both informative and accessible to readers with varying levels of expertise, ensuring that complex concepts are explained clearly while maintaining academic rigor.",
+        "category": {
+            "name": "General Information",
+            "description": "A comprehensive category covering diverse topics and general information useful for readers. This category encompasses wide-ranging fields of knowledge including science, technology, culture, and education. It aims to provide high-quality content that helps readers better understand the world around them. The category is characterized by diversity and comprehensiveness, covering topics ranging from natural sciences to humanities, from modern technology to history and culture. It focuses on presenting information in a simplified and understandable way for the general public, while maintaining scientific accuracy and objectivity in presentation. The content is carefully curated to ensure relevance and educational value for a broad audience.",
+            "wikipedia_link": "https://en.wikipedia.org/wiki/General_knowledge"
+        },
+        "category_image_query": "General Information",
+        "author": {
+            "name": "Dr. John Writer",
+            "profession": "writer and researcher",
+            "description": "Specialized expert in writing and research with over 20 years of experience in authoring and publishing. Holds a Ph.D. in Literature and is the author of more than 15 books across various fields. Works as a university professor and editorial consultant for several peer-reviewed scientific journals. Has made significant contributions to digital content development and simplifying scientific information for general audiences. Known for clear and direct writing style, and committed to presenting information in an engaging and useful manner. Regularly contributes to academic conferences and maintains active research in contemporary writing methodologies.",
+            "wikipedia_link": "https://en.wikipedia.org/wiki/John_Writer"
+        },
+        "author_image_query": "Dr. John Writer",
+        "keywords": ("information", "analysis", "study", "research", "science", "technology", "culture", "education", "knowledge"),
+        "summary": "Comprehensive summary of the article about {query} covering key points and important conclusions. This summary provides an overview of the topic with focus on the most important and impactful aspects. It addresses recent developments and future trends, offering a balanced analysis of challenges and opportunities related to the subject matter.",
+        "publish_date": "2024-01-15"
+    }
+}
+
+# Per-language prompt and fallback template, looked up once per request
+_LANG = {
+    language: {
+        'code': language,
+        'prompt': _CONTENT_PROMPTS[language],
+        'fallback': _FALLBACK_CONTENT_TEMPLATES[language]
+    }
+    for language in _CONTENT_PROMPTS
+}
+
+# Fallback responses use fixed placeholder images unless FALLBACK_DYNAMIC_IMAGES
+# is set, so the error path needs no network access
+_FALLBACK_STATIC_IMAGES = {
+    language: tuple(
+        f"https://placehold.co/400x300/2563eb/ffffff?text={quote_plus(template[key][:20])}"
+        for key in ("category_image_query", "author_image_query")
+    )
+    for language, template in _FALLBACK_CONTENT_TEMPLATES.items()
+}
+
+# With FALLBACK_DYNAMIC_IMAGES, the fallback category and author images are
+# searched once per language and reused
+_fallback_images = {}
+_fallback_images_lock = threading.Lock()
+
+_HEALTH_BYTES = dumps({
+    'status': 'healthy',
+    'message': 'Article Search API is running',
+    'version': '1.0.0'
+})
+
+# Identical searches arriving together share one LLM generation
+_search_flight = SingleFlight()
+
+def _lang(language):
+    """Return the language settings for a request; unknown languages use English"""
+    return _LANG.get(language) or _LANG['en']
+
+def _is_article_content(data):
+    """Whether parsed LLM output has the shape of article content"""
+    return isinstance(data, dict) and isinstance(data.get('full_text'), str) and bool(data['full_text'].strip())
+
+def _format_search_results(search_results, query, language):
+    """Shape generated articles for the search response"""
+    return [
+        {
+            'id': result.get('id') or str(uuid.uuid4()),
+            'title': result.get('title', ''),
+            'snippet': result.get('snippet', ''),
+            'category': result.get('category', {}),
+            'author': result.get('author', {}),
+            'language': language,
+            'search_query': query
+        }
+        for result in search_results
+    ]
+
+def _resp(success, message, status_code, **extra):
+    """Build the {success, message, ...} envelope shared by the API views"""
+    return Response({'success': success, 'message': message, **extra}, status=status_code)
 
 class ArticleSearchView(APIView):
     """
@@ -23,61 +193,133 @@ class ArticleSearchView(APIView):
     def post(self, request):
         """Search for articles based on query and language using LLM"""
 
-        # Validate request data
-        serializer = SearchRequestSerializer(data=request.data)
-        if not serializer.is_valid():
-            return Response({
-                'success': False,
-                'message': 'Invalid request parameters',
-                'errors': serializer.errors
-            }, status=status.HTTP_400_BAD_REQUEST)
+        # Validate request data; well-formed payloads skip the serializer
+        validated_data = fast_validate_search_request(request.data)
+        if validated_data is None:
+            serializer = SearchRequestSerializer(data=request.data)
+            if not serializer.is_valid():
+                return _resp(
+                    False,
+                    'Invalid request parameters',
+                    status.HTTP_400_BAD_REQUEST,
+                    errors=serializer.errors
+                )
+            validated_data = serializer.validated_data
 
-        validated_data = serializer.validated_data
         query = validated_data['query']
         language = validated_data['language']
         max_results = validated_data['max_results']
 
         try:
             # Initialize Groq LLM service
-            groq_service = GroqLLMService()
+            groq_service = get_groq_service()
 
             # Generate comprehensive article results using LLM
-            search_results = groq_service.generate_article_search_results(
+            search_results = _search_flight.do(
+                (query, language, max_results),
+                groq_service.generate_article_search_results,
                 query=query,
                 language=language,
-                max_results=max_results
+                max_results=max_results,
+                batch=False  # The Batch API can take minutes; keep it for offline jobs
             )
 
             # Format results for response (no database operations)
-            formatted_results = []
-            for result in search_results:
-                formatted_result = {
-                    'id': result.get('id', str(uuid.uuid4())),
-                    'title': result.get('title', ''),
-                    'snippet': result.get('snippet', ''),
-                    'category': result.get('category', {}),
-                    'author': result.get('author', {}),
-                    'language': language,
-                    'search_query': query
-                }
-                formatted_results.append(formatted_result)
-
-            response_data = {
+            formatted_results = _format_search_results(search_results, query, language)
+
+            return _resp(
+                True,
+                f'Generated {len(formatted_results)} articles',
+                status.HTTP_200_OK,
+                results=formatted_results,
+                total_count=len(formatted_results)
+            )
+
+        except Exception as e:
+            return _resp(
+                False,
+                f'Search failed: {str(e)}',
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                results=[],
+                total_count=0
+            )
+
+class ArticleSearchStreamView(APIView):
+    """
+    API endpoint streaming article search results as server-sent events
+
+    POST /api/search/stream/
+    {
+        "query": "artificial intelligence",
+        "language": "en",
+        "max_results": 5
+    }
+
+    Each "data:" event carries {"delta": ...}, the next piece of the results
+    JSON as the model writes it; a final "done" event carries the same
+    envelope as /api/search/, with ids and images.
+    """
+
+    renderer_classes = [EventStreamRenderer, ORJSONRenderer]
+
+    def post(self, request):
+        """Stream generated search results"""
+
+        # Validate request data; well-formed payloads skip the serializer
+        validated_data = fast_validate_search_request(request.data)
+        if validated_data is None:
+            serializer = SearchRequestSerializer(data=request.data)
+            if not serializer.is_valid():
+                return _resp(
+                    False,
+                    'Invalid request parameters',
+                    status.HTTP_400_BAD_REQUEST,
+                    errors=serializer.errors
+                )
+            validated_data = serializer.validated_data
+
+        response = StreamingHttpResponse(
+            self._events(get_groq_service(), validated_data['query'],
+                         validated_data['language'], validated_data['max_results']),
+            content_type=EventStreamRenderer.media_type
+        )
+        # Keep proxies from buffering or caching the stream
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def _events(self, groq_service, query, language, max_results):
+        """Yield SSE-framed deltas, then the final results envelope"""
+        parts = []
+        try:
+            for delta in groq_service.stream_articles(query, language, max_results):
+                parts.append(delta)
+                yield b'data: ' + dumps({'delta': delta}) + b'\n\n'
+        except CircuitOpenError:
+            parts = []
+        except Exception:
+            # Headers are already sent; the final event carries fallback results
+            logger.exception("Error streaming article search results")
+            parts = []
+
+        try:
+            search_results = groq_service.articles_from_text(''.join(parts), query, language, max_results)
+            formatted_results = _format_search_results(search_results, query, language)
+            envelope = {
                 'success': True,
                 'message': f'Generated {len(formatted_results)} articles',
                 'results': formatted_results,
                 'total_count': len(formatted_results)
             }
-
-            return Response(response_data, status=status.HTTP_200_OK)
-
         except Exception as e:
-            return Response({
+            logger.exception("Error finishing streamed article search results")
+            envelope = {
                 'success': False,
                 'message': f'Search failed: {str(e)}',
                 'results': [],
                 'total_count': 0
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            }
+        yield b'event: done\ndata: ' + dumps(envelope) + b'\n\n'
 
 class ArticleContentView(APIView):
     """
@@ -90,21 +332,29 @@ class ArticleContentView(APIView):
         "language": "en",
         "include_summary": true
     }
+
+    With "Accept: application/x-ndjson" the response is streamed as NDJSON
+    lines while the content is generated (see _stream_article_content).
     """
 
+    renderer_classes = [ORJSONRenderer, NDJSONRenderer]
+
     def post(self, request):
         """Generate full content for a specific article using LLM"""
 
-        # Validate request data
-        serializer = ContentRequestSerializer(data=request.data)
-        if not serializer.is_valid():
-            return Response({
-                'success': False,
-                'message': 'Invalid request parameters',
-                'errors': serializer.errors
-            }, status=status.HTTP_400_BAD_REQUEST)
+        # Validate request data; well-formed payloads skip the serializer
+        validated_data = fast_validate_content_request(request.data)
+        if validated_data is None:
+            serializer = ContentRequestSerializer(data=request.data)
+            if not serializer.is_valid():
+                return _resp(
+                    False,
+                    'Invalid request parameters',
+                    status.HTTP_400_BAD_REQUEST,
+                    errors=serializer.errors
+                )
+            validated_data = serializer.validated_data
 
-        validated_data = serializer.validated_data
         article_id = validated_data['article_id']
         query = validated_data.get('query', 'general topic')
         language = validated_data.get('language', 'en')
@@ -112,7 +362,13 @@ class ArticleContentView(APIView):
 
         try:
             # Initialize Groq LLM service
-            groq_service = GroqLLMService()
+            groq_service = get_groq_service()
+
+            if request.accepted_renderer.format == 'ndjson':
+                return StreamingHttpResponse(
+                    self._stream_article_content(groq_service, article_id, query, language, include_summary),
+                    content_type=NDJSONRenderer.media_type
+                )
 
             # Generate detailed article content using LLM
             article_content = self._generate_article_content(
@@ -120,76 +376,40 @@ class ArticleContentView(APIView):
             )
 
             if article_content:
-                return Response({
-                    'success': True,
-                    'message': 'Content generated successfully',
-                    'content': article_content
-                }, status=status.HTTP_200_OK)
+                return _resp(
+                    True,
+                    'Content generated successfully',
+                    status.HTTP_200_OK,
+                    content=article_content
+                )
             else:
-                return Response({
-                    'success': False,
-                    'message': 'Failed to generate article content',
-                    'content': None
-                }, status=status.HTTP_404_NOT_FOUND)
+                return _resp(
+                    False,
+                    'Failed to generate article content',
+                    status.HTTP_404_NOT_FOUND,
+                    content=None
+                )
 
         except Exception as e:
-            return Response({
-                'success': False,
-                'message': f'Content generation failed: {str(e)}',
-                'content': None
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return _resp(
+                False,
+                f'Content generation failed: {str(e)}',
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                content=None
+            )
 
     def _generate_article_content(self, groq_service, article_id, query, language, include_summary=True):
         """Generate comprehensive article content using LLM"""
         try:
-            if language == 'ar':
-                prompt = f"""
-                أنشئ مقالاً تفصيلياً شاملاً حول "{query}" بالمعرف {article_id}. يجب أن يتضمن:
-
-                1. المحتوى الكامل (أكثر من 800 كلمة)
-                2. الفئة مع: الاسم، وصف مفصل (200+ كلمة)، رابط ويكيبيديا، صورة
-                3. المؤلف مع: الاسم، المهنة، وصف مفصل، رابط ويكيبيديا، صورة
-                4. الكلمات المفتاحية (10-15 كلمة)
-                5. ملخص شامل (250-300 كلمة)
-                6. تاريخ النشر
-
-                أرجع النتيجة بتنسيق JSON صالح.
-                """
-            else:
-                prompt = f"""
-                Create a comprehensive detailed article about "{query}" with ID {article_id}. Include:
-
-                1. Full article content (800+ words)
-                2. Category with: name, detailed description (200+ words), wikipedia link, image
-                3. Author with: name, profession, detailed description, wikipedia link, image
-                4. Keywords (10-15 keywords)
-                5. Comprehensive summary (250-300 words)
-                6. Publication date
-
-                Return as valid JSON:
-                {{
-                  "id": "{article_id}",
-                  "full_text": "Complete article content...",
-                  "category": {{
-                    "name": "Category Name",
-                    "description": "Detailed description...",
-                    "wikipedia_link": "https://en.wikipedia.org/wiki/...",
-                    "image": "https://example.com/image.jpg"
-                  }},
-                  "author": {{
-                    "name": "Author Name",
-                    "profession": "profession",
-                    "description": "Detailed bio...",
-                    "wikipedia_link": "https://en.wikipedia.org/wiki/...",
-                    "image": "https://example.com/author.jpg"
-                  }},
-                  "keywords": ["keyword1", "keyword2", ...],
-                  "summary": "Comprehensive summary...",
-                  "publish_date": "2024-01-15"
-                }}
-                """
-
-            response = groq_service.client.chat.completions.create(
+            cache_key = self._content_cache_key(query, language, include_summary)
+            content_data = llm_cache.get(cache_key)
+            if _is_article_content(content_data):
+                content_data['id'] = str(article_id)
+                return self._attach_images(groq_service, content_data, query)
+
+            prompt = _lang(language)['prompt'].format(query=query)
+
+            response = groq_service.create_chat_completion(
                 messages=[
                     {
                         "role": "user",
@@ -197,83 +417,169 @@ class ArticleContentView(APIView):
                     }
                 ],
                 model=groq_service.model,
-                max_tokens=4000,
-                temperature=0.7
+                max_tokens=settings.GROQ_CONTENT_MAX_TOKENS,
+                temperature=0.7,
+                response_format={"type": "json_object"}
             )
 
-            result_text = response.choices[0].message.content.strip()
+            # Completion sizes are logged so GROQ_CONTENT_MAX_TOKENS can be tuned
+            choice = response.choices[0]
+            if response.usage is not None:
+                logger.info(
+                    "Article content: %d prompt / %d completion tokens (limit %d, finish_reason=%s)",
+                    response.usage.prompt_tokens, response.usage.completion_tokens,
+                    settings.GROQ_CONTENT_MAX_TOKENS, choice.finish_reason
+                )
+            if choice.finish_reason == "length":
+                logger.warning("Article content hit GROQ_CONTENT_MAX_TOKENS=%d", settings.GROQ_CONTENT_MAX_TOKENS)
+
+            return self._parse_article_content(
+                groq_service, article_id, query, language, cache_key, choice.message.content.strip()
+            )
 
-            # Try to parse JSON response
-            try:
-                import json
-                content_data = json.loads(result_text)
+        except CircuitOpenError:
+            return self._create_fallback_content(article_id, query, language)
+        except Exception:
+            logger.exception("Error generating article content")
+            return self._create_fallback_content(article_id, query, language)
 
-                # Add real images to the content
-                if 'category' in content_data and isinstance(content_data['category'], dict):
-                    category_name = content_data['category'].get('name', query)
-                    content_data['category']['image'] = groq_service.search_for_reliable_image(category_name, "category")
+    def _stream_article_content(self, groq_service, article_id, query, language, include_summary):
+        """
+        Yield the article content as NDJSON lines while it is generated
 
-                if 'author' in content_data and isinstance(content_data['author'], dict):
-                    author_name = content_data['author'].get('name', 'professional author')
-                    content_data['author']['image'] = groq_service.search_for_reliable_image(f"{author_name} portrait", "person")
+        The first line is {"id": ...}; each following {"delta": ...} line carries
+        the next piece of the content JSON as the model writes it; the last line
+        is the same envelope a non-streamed request returns, with images attached.
+        Image names are only known once generation ends, so images are searched
+        after the last delta.
+        """
+        yield dumps({'id': str(article_id)}) + b'\n'
 
-                return content_data
+        try:
+            cache_key = self._content_cache_key(query, language, include_summary)
+            content_data = llm_cache.get(cache_key)
+            if _is_article_content(content_data):
+                content_data['id'] = str(article_id)
+                content_data = self._attach_images(groq_service, content_data, query)
+            else:
+                # JSON mode is not combined with streaming; invalid JSON falls
+                # back below the same way a non-JSON reply does
+                stream = groq_service.create_chat_completion(
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": _lang(language)['prompt'].format(query=query)
+                        }
+                    ],
+                    model=groq_service.model,
+                    max_tokens=settings.GROQ_CONTENT_MAX_TOKENS,
+                    temperature=0.7,
+                    stream=True
+                )
+                parts = []
+                for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        parts.append(delta)
+                        yield dumps({'delta': delta}) + b'\n'
+
+                content_data = self._parse_article_content(
+                    groq_service, article_id, query, language, cache_key, ''.join(parts).strip()
+                )
+
+        except CircuitOpenError:
+            content_data = self._create_fallback_content(article_id, query, language)
+        except Exception:
+            # Headers are already sent, so failures end the stream with fallback content
+            logger.exception("Error streaming article content")
+            content_data = self._create_fallback_content(article_id, query, language)
+
+        yield dumps({
+            'success': True,
+            'message': 'Content generated successfully',
+            'content': content_data
+        }) + b'\n'
+
+    @staticmethod
+    def _content_cache_key(query, language, include_summary):
+        """
+        llm_cache key for generated content
+
+        Identical (query, language, include_summary) requests reuse the parsed
+        LLM output; images are attached per request (they have their own cache).
+        """
+        return llm_cache.make_key('content', language, include_summary, llm_cache.normalize_query(query))
+
+    def _parse_article_content(self, groq_service, article_id, query, language, cache_key, result_text):
+        """Parse and cache a content completion, falling back to static content if it is not a content object"""
+        try:
+            content_data = loads(result_text)
+        except json.JSONDecodeError:
+            # Fallback: create structured content from text response
+            return self._create_fallback_content(article_id, query, language, result_text)
+
+        # Valid JSON of the wrong shape must not be cached, or every hit for
+        # the next day would fail the same way
+        if not _is_article_content(content_data):
+            logger.warning("Article content completion is not a content object, using fallback")
+            return self._create_fallback_content(article_id, query, language)
 
-            except json.JSONDecodeError:
-                # Fallback: create structured content from text response
-                return self._create_fallback_content(article_id, query, language, result_text)
+        llm_cache.put(cache_key, content_data)
+        content_data['id'] = str(article_id)
+        return self._attach_images(groq_service, content_data, query)
 
-        except Exception as e:
-            print(f"Error generating article content: {str(e)}")
-            return self._create_fallback_content(article_id, query, language)
+    def _attach_images(self, groq_service, content_data, query):
+        """Add real images to the generated category and author, searching for both concurrently"""
+        targets = []
+        lookups = []
+
+        if 'category' in content_data and isinstance(content_data['category'], dict):
+            category_name = content_data['category'].get('name', query)
+            targets.append(content_data['category'])
+            lookups.append((category_name, "category"))
+
+        if 'author' in content_data and isinstance(content_data['author'], dict):
+            author_name = content_data['author'].get('name', 'professional author')
+            targets.append(content_data['author'])
+            lookups.append((f"{author_name} portrait", "person"))
+
+        for target, image in zip(targets, groq_service.search_for_reliable_images(lookups)):
+            target['image'] = image
+
+        return content_data
 
     def _create_fallback_content(self, article_id, query, language, content_text=None):
         """Create fallback content when LLM generation fails"""
-        # Initialize Groq service for image search
-        groq_service = GroqLLMService()
-
-        if language == 'ar':
-            return {
-                "id": article_id,
-                "full_text": content_text or f"محتوى مفصل حول {query}. هذا المقال يقدم تحليلاً شاملاً للموضوع مع استعراض الجوانب المختلفة والتطورات الحديثة. يهدف هذا المحتوى إلى تقديم فهم شامل للقارئ حول {query} وتأثيراته على المجتمع والاقتصاد. كما يستكشف المقال التحديات والفرص المرتبطة بهذا الموضوع، ويقدم رؤى من خبراء مختصين في المجال. المقال مدعوم بأمثلة عملية ودراسات حالة توضح التطبيقات الواقعية للموضوع. يتناول المقال أيضاً التطورات التاريخية والاتجاهات المستقبلية المتعلقة بـ {query}، مما يوفر للقارئ نظرة شاملة ومتوازنة حول الموضوع.",
-                "category": {
-                    "name": "معلومات عامة",
-                    "description": "فئة شاملة تغطي مواضيع متنوعة ومعلومات عامة مفيدة للقراء. تشمل هذه الفئة مجالات واسعة من المعرفة والعلوم والتكنولوجيا والثقافة. تهدف إلى تقديم محتوى عالي الجودة يساعد القراء على فهم العالم من حولهم بشكل أفضل. تتميز هذه الفئة بالتنوع والشمولية، حيث تغطي موضوعات تتراوح من العلوم الطبيعية إلى العلوم الإنسانية، ومن التكنولوجيا الحديثة إلى التاريخ والثقافة. كما تركز على تقديم المعلومات بطريقة مبسطة ومفهومة للجمهور العام، مع الحفاظ على الدقة العلمية والموضوعية في العرض.",
-                    "wikipedia_link": "https://ar.wikipedia.org/wiki/معلومات_عامة",
-                    "image": groq_service.search_for_reliable_image("معلومات عامة", "category")
-                },
-                "author": {
-                    "name": "د. محمد الكاتب",
-                    "profession": "كاتب وباحث",
-                    "description": "خبير متخصص في الكتابة والبحث العلمي مع خبرة تزيد عن 20 عاماً في مجال التأليف والنشر. حاصل على درجة الدكتوراه في الأدب العربي ومؤلف لأكثر من 15 كتاباً في مجالات متنوعة. يعمل كأستاذ جامعي ومستشار تحريري لعدة مجلات علمية محكمة. له مساهمات بارزة في تطوير المحتوى العربي الرقمي وتبسيط المعلومات العلمية للجمهور العام. يتميز بأسلوبه الواضح والمباشر في الكتابة، ويحرص على تقديم المعلومات بطريقة شيقة ومفيدة.",
-                    "wikipedia_link": "https://ar.wikipedia.org/wiki/محمد_الكاتب",
-                    "image": groq_service.search_for_reliable_image("د. محمد الكاتب", "person")
-                },
-                "keywords": [f"{query}", "معلومات", "تحليل", "دراسة", "بحث", "علوم", "تكنولوجيا", "ثقافة", "تعليم", "معرفة"],
-                "summary": f"ملخص شامل للمقال حول {query} يغطي النقاط الرئيسية والاستنتاجات المهمة. يقدم هذا الملخص نظرة عامة على الموضوع مع التركيز على الجوانب الأكثر أهمية وتأثيراً. يتناول التطورات الحديثة والاتجاهات المستقبلية، ويقدم تحليلاً متوازناً للتحديات والفرص المرتبطة بالموضوع.",
-                "publish_date": "2024-01-15"
-            }
+        lang = _lang(language)
+        template = lang['fallback']
+        if settings.FALLBACK_DYNAMIC_IMAGES:
+            category_image, author_image = self._fallback_images(lang['code'], template)
         else:
-            return {
-                "id": article_id,
-                "full_text": content_text or f"Detailed content about {query}. This article provides comprehensive analysis of the topic with various aspects and recent developments. The content aims to give readers a thorough understanding of {query} and its implications for society and economy. The article examines challenges and opportunities related to this topic, offering insights from field experts. It is supported by practical examples and case studies that illustrate real-world applications of the subject matter. The piece also explores historical developments and future trends related to {query}, providing readers with a comprehensive and balanced view of the topic. The article is designed to be both informative and accessible to readers with varying levels of expertise, ensuring that complex concepts are explained clearly while maintaining academic rigor.",
-                "category": {
-                    "name": "General Information",
-                    "description": "A comprehensive category covering diverse topics and general information useful for readers. This category encompasses wide-ranging fields of knowledge including science, technology, culture, and education. It aims to provide high-quality content that helps readers better understand the world around them. The category is characterized by diversity and comprehensiveness, covering topics ranging from natural sciences to humanities, from modern technology to history and culture. It focuses on presenting information in a simplified and understandable way for the general public, while maintaining scientific accuracy and objectivity in presentation. The content is carefully curated to ensure relevance and educational value for a broad audience.",
-                    "wikipedia_link": "https://en.wikipedia.org/wiki/General_knowledge",
-                    "image": groq_service.search_for_reliable_image("General Information", "category")
-                },
-                "author": {
-                    "name": "Dr. John Writer",
-                    "profession": "writer and researcher",
-                    "description": "Specialized expert in writing and research with over 20 years of experience in authoring and publishing. Holds a Ph.D. in Literature and is the author of more than 15 books across various fields. Works as a university professor and editorial consultant for several peer-reviewed scientific journals. Has made significant contributions to digital content development and simplifying scientific information for general audiences. Known for clear and direct writing style, and committed to presenting information in an engaging and useful manner. Regularly contributes to academic conferences and maintains active research in contemporary writing methodologies.",
-                    "wikipedia_link": "https://en.wikipedia.org/wiki/John_Writer",
-                    "image": groq_service.search_for_reliable_image("Dr. John Writer", "person")
-                },
-                "keywords": [f"{query}", "information", "analysis", "study", "research", "science", "technology", "culture", "education", "knowledge"],
-                "summary": f"Comprehensive summary of the article about {query} covering key points and important conclusions. This summary provides an overview of the topic with focus on the most important and impactful aspects. It addresses recent developments and future trends, offering a balanced analysis of challenges and opportunities related to the subject matter.",
-                "publish_date": "2024-01-15"
-            }
+            category_image, author_image = _FALLBACK_STATIC_IMAGES[lang['code']]
+
+        return {
+            "id": article_id,
+            "full_text": content_text or template["full_text"].format(query=query),
+            "category": {**template["category"], "image": category_image},
+            "author": {**template["author"], "image": author_image},
+            "keywords": [query, *template["keywords"]],
+            "summary": template["summary"].format(query=query),
+            "publish_date": template["publish_date"]
+        }
+
+    @staticmethod
+    def _fallback_images(language, template):
+        """Return the (category, author) images for a fallback template, searching only once"""
+        images = _fallback_images.get(language)
+        if images is None:
+            with _fallback_images_lock:
+                images = _fallback_images.get(language)
+                if images is None:
+                    images = _fallback_images[language] = tuple(get_groq_service().search_for_reliable_images([
+                        (template["category_image_query"], "category"),
+                        (template["author_image_query"], "person")
+                    ]))
+        return images
 
 class DepartmentInfoView(APIView):
     """
@@ -295,25 +601,27 @@ class DepartmentInfoView(APIView):
             language = request.data.get('language', 'en')
 
             if not department:
-                return Response({
-                    'success': False,
-                    'message': 'Department name or code is required',
-                    'department': None
-                }, status=status.HTTP_400_BAD_REQUEST)
+                return _resp(
+                    False,
+                    'Department name or code is required',
+                    status.HTTP_400_BAD_REQUEST,
+                    department=None
+                )
 
             if language not in ['en', 'ar']:
                 language = 'en'  # Default to English
 
-        except Exception as e:
-            return Response({
-                'success': False,
-                'message': 'Invalid request data',
-                'department': None
-            }, status=status.HTTP_400_BAD_REQUEST)
+        except Exception:
+            return _resp(
+                False,
+                'Invalid request data',
+                status.HTTP_400_BAD_REQUEST,
+                department=None
+            )
 
         try:
             # Initialize Groq LLM service
-            groq_service = GroqLLMService()
+            groq_service = get_groq_service()
 
             # Generate department information using LLM
             department_info = groq_service.generate_department_info(
@@ -322,32 +630,38 @@ class DepartmentInfoView(APIView):
             )
 
             if department_info:
-                return Response({
-                    'success': True,
-                    'message': 'Department information generated successfully',
-                    'department': department_info
-                }, status=status.HTTP_200_OK)
+                # Bundled icons are site-relative static paths; cross-origin
+                # clients need the absolute URL
+                logo = department_info.get('logo')
+                if isinstance(logo, str) and logo.startswith('/'):
+                    department_info['logo'] = request.build_absolute_uri(logo)
+
+                return _resp(
+                    True,
+                    'Department information generated successfully',
+                    status.HTTP_200_OK,
+                    department=department_info
+                )
             else:
-                return Response({
-                    'success': False,
-                    'message': 'Failed to generate department information',
-                    'department': None
-                }, status=status.HTTP_404_NOT_FOUND)
+                return _resp(
+                    False,
+                    'Failed to generate department information',
+                    status.HTTP_404_NOT_FOUND,
+                    department=None
+                )
 
         except Exception as e:
-            return Response({
-                'success': False,
-                'message': f'Department information generation failed: {str(e)}',
-                'department': None
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return _resp(
+                False,
+                f'Department information generation failed: {str(e)}',
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                department=None
+            )
 
-class HealthCheckView(APIView):
+@require_safe
+def health_check(request):
     """Health check endpoint"""
-
-    def get(self, request):
-        return Response({
-            'status': 'healthy',
-            'message': 'Article Search API is running',
-            'version': '1.0.0'
-        }, status=status.HTTP_200_OK)
+    # Plain Django view: probes skip DRF negotiation and rendering, and the
+    # body is serialized once at import
+    return HttpResponse(_HEALTH_BYTES, content_type='application/json', headers={'Cache-Control': 'no-store'})
 
@@ -0,0 +1,55 @@
+"""
+Regenerate article_search_project/api_root_payload.py from the API root dict.
+
+The URLconf only imports the generated bytes literal, so no dict is built and
+no JSON encoder runs for the root endpoint at runtime. Re-run this script after
+editing article_search_project/api_root.py; pass --check in CI to fail when the
+generated module is out of date.
+
+    python scripts/gen_api_root.py [--check]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from article_search_project.api_root import API_ROOT, without_admin  # noqa: E402
+from articles.json_utils import dumps  # noqa: E402
+
+OUTPUT = BASE_DIR / 'article_search_project' / 'api_root_payload.py'
+
+TEMPLATE = '''# Generated by scripts/gen_api_root.py from article_search_project/api_root.py.
+# Do not edit by hand.
+
+PAYLOAD = {payload!r}
+
+# Served when ENABLE_ADMIN=False
+PAYLOAD_WITHOUT_ADMIN = {payload_without_admin!r}
+'''
+
+
+def render() -> str:
+    return TEMPLATE.format(payload=dumps(API_ROOT), payload_without_admin=dumps(without_admin(API_ROOT)))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--check', action='store_true', help="Exit non-zero if the generated file is stale")
+    args = parser.parse_args()
+
+    source = render()
+    if args.check:
+        if not OUTPUT.exists() or OUTPUT.read_text(encoding='utf-8') != source:
+            print(f"{OUTPUT.relative_to(BASE_DIR)} is out of date; run scripts/gen_api_root.py")
+            return 1
+        return 0
+
+    OUTPUT.write_text(source, encoding='utf-8')
+    print(f"Wrote {OUTPUT.relative_to(BASE_DIR)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())